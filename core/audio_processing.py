@@ -1,8 +1,25 @@
+import shutil
+import hashlib
+import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+
+# numpy is imported where audio is handled, so path/metadata helpers stay light
+if TYPE_CHECKING:
+    import numpy as np
 
 SUPPORTED_FORMATS = (".wav", ".mp3", ".flac", ".mp4")
 
+# Whisper-family models expect 16 kHz mono float32 input
+SAMPLE_RATE = 16000
+
+# Voice activity detection: silences shorter than this stay inside a region,
+# regions are padded on both sides and shorter bursts are dropped
+VAD_THRESHOLD = 0.5
+VAD_MIN_SILENCE_MS = 1000
+VAD_SPEECH_PAD_MS = 400
+VAD_MIN_SPEECH_MS = 250
+
 def get_audio_file(
     filename: str,
     samples_dir: str = "samples/audio"
@@ -32,6 +49,245 @@ def get_audio_file(
     return str(file_path)
 
 
+def audio_file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of the audio file contents, independent of its name.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probe_duration(file_path: str) -> Optional[float]:
+    """
+    Audio duration in seconds read from container metadata, without decoding.
+    Tries soundfile (WAV/FLAC headers) and then ffprobe (MP3/MP4).
+    """
+    try:
+        import soundfile as sf
+        info = sf.info(file_path)
+        if info.samplerate and info.frames:
+            return info.frames / info.samplerate
+    except Exception:
+        pass
+
+    if shutil.which("ffprobe"):
+        probe = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                file_path,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        try:
+            return float(probe.stdout.strip())
+        except ValueError:
+            pass
+
+    return None
+
+
+def load_audio(file_path: str, sr: int = SAMPLE_RATE) -> "np.ndarray":
+    """
+    Decode an audio file once to mono float32 at the given sample rate.
+    Uses ffmpeg (decode and resample in one pass) when available, else librosa.
+    """
+    import numpy as np
+
+    if shutil.which("ffmpeg"):
+        decoded = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-v", "error",
+                "-i", file_path,
+                "-f", "f32le", "-ac", "1", "-ar", str(sr),
+                "-",
+            ],
+            capture_output=True,
+        )
+        if decoded.returncode == 0:
+            return np.frombuffer(decoded.stdout, dtype=np.float32)
+
+    import librosa
+    audio, _ = librosa.load(file_path, sr=sr, mono=True, dtype=np.float32)
+    return audio
+
+
+def _ffmpeg_blocks(file_path: str, sr: int, block_samples: int) -> Iterator["np.ndarray"]:
+    import numpy as np
+
+    # Decode through a pipe so only one block is held at a time
+    process = subprocess.Popen(
+        [
+            "ffmpeg", "-nostdin", "-v", "error",
+            "-i", file_path,
+            "-f", "f32le", "-ac", "1", "-ar", str(sr),
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            data = process.stdout.read(block_samples * 4)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) - len(data) % 4], dtype=np.float32)
+    finally:
+        process.kill()
+        process.wait()
+
+
+def stream_audio(
+    file_path: str,
+    window_s: float = 30.0,
+    overlap_s: float = 5.0,
+    sr: int = SAMPLE_RATE,
+) -> Iterator[Tuple[float, "np.ndarray"]]:
+    """
+    Read an audio file incrementally as overlapping windows.
+    Yields (offset in seconds, mono float32 window); consecutive windows
+    share overlap_s seconds and the last one may be shorter. With ffmpeg
+    at most about one window is in memory; without it the file is decoded
+    whole with librosa and then windowed.
+    """
+    import numpy as np
+
+    window = int(window_s * sr)
+    hop = window - int(overlap_s * sr)
+    if hop <= 0:
+        raise ValueError("overlap_s must be shorter than window_s")
+
+    if shutil.which("ffmpeg"):
+        blocks = _ffmpeg_blocks(file_path, sr, hop)
+    else:
+        blocks = iter([load_audio(file_path, sr)])
+
+    buffer = np.empty(0, dtype=np.float32)
+    offset = 0
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        while len(buffer) >= window:
+            yield offset / sr, buffer[:window]
+            buffer = buffer[hop:]
+            offset += hop
+
+    # Leftover audio is new unless it is only the tail already covered by the last window
+    if len(buffer) > (window - hop if offset else 0):
+        yield offset / sr, buffer
+
+
+def _energy_speech_regions(
+    audio: "np.ndarray",
+    sr: int,
+    min_silence_ms: int,
+    speech_pad_ms: int,
+    min_speech_ms: int,
+    frame_ms: int = 30,
+    dynamic_range_db: float = 40.0,
+) -> List[Tuple[int, int]]:
+    import numpy as np
+
+    # Frames within dynamic_range_db of the loudest frame count as speech
+    frame = int(sr * frame_ms / 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    rms_db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    active = rms_db > max(rms_db.max() - dynamic_range_db, -60.0)
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    pad = int(sr * speech_pad_ms / 1000)
+    min_silence = int(sr * min_silence_ms / 1000)
+    min_speech = int(sr * min_speech_ms / 1000)
+
+    regions: List[Tuple[int, int]] = []
+    for start, end in zip(edges[0::2] * frame, edges[1::2] * frame):
+        if end - start < min_speech:
+            continue
+        start, end = max(0, int(start) - pad), min(len(audio), int(end) + pad)
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def detect_speech(
+    audio: "np.ndarray",
+    sr: int = SAMPLE_RATE,
+    threshold: float = VAD_THRESHOLD,
+    min_silence_ms: int = VAD_MIN_SILENCE_MS,
+    speech_pad_ms: int = VAD_SPEECH_PAD_MS,
+    min_speech_ms: int = VAD_MIN_SPEECH_MS,
+) -> List[Tuple[int, int]]:
+    """
+    Speech regions of a decoded buffer as (start, end) sample offsets.
+    Uses the Silero VAD bundled with faster-whisper when it is installed,
+    which also rejects hold music; otherwise falls back to frame energy,
+    which only rejects silence.
+    """
+    try:
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+    except ImportError:
+        return _energy_speech_regions(audio, sr, min_silence_ms, speech_pad_ms, min_speech_ms)
+
+    options = VadOptions(
+        threshold=threshold,
+        min_silence_duration_ms=min_silence_ms,
+        speech_pad_ms=speech_pad_ms,
+        min_speech_duration_ms=min_speech_ms,
+    )
+    return [
+        (timestamp["start"], timestamp["end"])
+        for timestamp in get_speech_timestamps(audio, options, sampling_rate=sr)
+    ]
+
+
+def extract_speech(audio: "np.ndarray", regions: List[Tuple[int, int]]) -> "np.ndarray":
+    """
+    Concatenate the speech regions of a buffer into one shorter buffer.
+    """
+    import numpy as np
+
+    if not regions:
+        return audio[:0]
+    return np.concatenate([audio[start:end] for start, end in regions])
+
+
+def speech_to_original_time(
+    seconds: Union[float, "np.ndarray"],
+    regions: List[Tuple[int, int]],
+    sr: int = SAMPLE_RATE,
+    is_end: bool = False,
+) -> Union[float, "np.ndarray"]:
+    """
+    Map timestamps in the extract_speech buffer back to the original audio;
+    takes a single time or an array of times.
+    End timestamps on a region boundary stay in the earlier region.
+    """
+    import numpy as np
+
+    if not regions:
+        return seconds
+
+    region_starts = np.array([start for start, _ in regions])
+    lengths = np.array([end - start for start, end in regions])
+    region_ends = np.cumsum(lengths)
+    sample = np.asarray(seconds, dtype=np.float64) * sr
+
+    index = np.searchsorted(region_ends, sample, side="left" if is_end else "right")
+    index = np.minimum(index, len(regions) - 1)
+    original = (region_starts[index] + sample - (region_ends[index] - lengths[index])) / sr
+    return float(original) if original.ndim == 0 else original
+
+
 def get_audio_files(samples_dir: str = "samples/audio") -> list:
     """
     Load all audio files from a folder instead of a single file.
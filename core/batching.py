@@ -0,0 +1,136 @@
+"""
+Micro-batching for request/response serving.
+Concurrent requests for the same model are queued and handed to the model
+together: a batch closes once it is full or once the first request in it
+has waited max_wait_s, whichever comes first.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+from core.profiling import summarize
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a batcher's queue is at its limit."""
+
+
+class MicroBatcher:
+    """
+    Collects submitted items into batches for process_batch, which gets a
+    list of items and returns one result per item, in order. A result that
+    is an Exception fails only its own request.
+    submit() returns a Future; a full queue raises QueueFullError instead
+    of letting latency grow without bound.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 8,
+        max_wait_s: float = 0.05,
+        max_queue: int = 64,
+        name: str = "batcher",
+        latency_window: int = 1000,
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_s
+        self.max_queue = max_queue
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._queue_waits: deque = deque(maxlen=latency_window)
+        self._stats_lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.in_flight = 0
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.time()))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            raise QueueFullError(f"{self.name}: queue limit of {self.max_queue} reached")
+        return future
+
+    def _collect(self) -> list:
+        # Block for the first request, then wait at most max_wait_s for more
+        batch = [self._queue.get()]
+        deadline = time.time() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.time()
+            with self._stats_lock:
+                self.in_flight = len(batch)
+                self.batches += 1
+                self._queue_waits.extend(started - submitted for _, _, submitted in batch)
+
+            try:
+                results = list(self.process_batch([item for item, _, _ in batch]))
+                if len(results) != len(batch):
+                    # Never leave a request waiting on a result that will not come
+                    error = RuntimeError(f"{self.name}: got {len(results)} result(s) for a batch of {len(batch)}")
+                    results = results[:len(batch)] + [error] * (len(batch) - len(results))
+            except Exception as e:
+                results = [e] * len(batch)
+
+            failed = 0
+            for (_, future, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                    failed += 1
+                else:
+                    future.set_result(result)
+
+            finished = time.time()
+            with self._stats_lock:
+                self.in_flight = 0
+                self.completed += len(batch) - failed
+                self.failed += failed
+                self._latencies.extend(finished - submitted for _, _, submitted in batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, request counts and latency percentiles (seconds) over
+        the most recent requests.
+        """
+        with self._stats_lock:
+            latencies = list(self._latencies)
+            queue_waits = list(self._queue_waits)
+            served = self.completed + self.failed
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "batches": self.batches,
+                "mean_batch_size": served / self.batches if self.batches else 0.0,
+                "latency": summarize(latencies, percentiles=(50, 95)),
+                "queue_wait": summarize(queue_waits, percentiles=(50, 95)),
+            }
@@ -0,0 +1,106 @@
+"""
+CPU-only speaker diarization for local backends.
+Each transcription segment gets a voice embedding (MFCC mean and standard
+deviation, pooled from one MFCC pass over the whole buffer), and the
+embeddings are clustered into speakers with agglomerative clustering.
+Speaker ids follow the Mistral format ("speaker_1", "speaker_2", ...),
+numbered in order of first appearance.
+"""
+
+import numpy as np
+from typing import Optional
+
+from core.audio_processing import SAMPLE_RATE
+
+# Call-center recordings: agent and customer
+DEFAULT_NUM_SPEAKERS = 2
+
+# 25 ms windows every 10 ms at 16 kHz, the usual framing for speaker features
+N_MFCC = 20
+N_MELS = 40
+N_FFT = 400
+HOP_LENGTH = 160
+
+
+def segment_embeddings(
+    audio: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    sr: int = SAMPLE_RATE,
+) -> np.ndarray:
+    """
+    One embedding row per segment: the mean and standard deviation of its
+    MFCC frames (excluding c0, which mostly tracks loudness).
+    Frames are pooled with cumulative sums, so the cost is one MFCC pass
+    over the audio regardless of the number of segments.
+    """
+    import librosa
+
+    mfcc = librosa.feature.mfcc(
+        y=audio, sr=sr, n_mfcc=N_MFCC, n_mels=N_MELS, n_fft=N_FFT, hop_length=HOP_LENGTH
+    )[1:]
+    n_frames = mfcc.shape[1]
+
+    first = np.clip((starts * sr / HOP_LENGTH).astype(np.int64), 0, n_frames - 1)
+    last = np.clip((ends * sr / HOP_LENGTH).astype(np.int64), first + 1, n_frames)
+    counts = (last - first)[:, None]
+
+    sums = np.pad(np.cumsum(mfcc, axis=1), ((0, 0), (1, 0))).T
+    squares = np.pad(np.cumsum(mfcc ** 2, axis=1), ((0, 0), (1, 0))).T
+
+    mean = (sums[last] - sums[first]) / counts
+    variance = np.maximum((squares[last] - squares[first]) / counts - mean ** 2, 0.0)
+    return np.hstack((mean, np.sqrt(variance)))
+
+
+def cluster_speakers(
+    embeddings: np.ndarray,
+    num_speakers: Optional[int] = DEFAULT_NUM_SPEAKERS,
+    distance_threshold: float = 0.7,
+) -> np.ndarray:
+    """
+    Cluster embeddings into speakers (average-linkage, cosine distance on
+    standardized features). With num_speakers=None the number of speakers
+    is found by cutting the tree at distance_threshold instead.
+    Returns labels 0, 1, ... in order of first appearance.
+    """
+    from scipy.cluster.hierarchy import fcluster, linkage
+
+    n_segments = len(embeddings)
+    if n_segments == 0:
+        return np.zeros(0, dtype=np.int16)
+    if n_segments == 1:
+        return np.zeros(1, dtype=np.int16)
+
+    scale = embeddings.std(axis=0)
+    standardized = (embeddings - embeddings.mean(axis=0)) / np.where(scale > 0, scale, 1.0)
+    tree = linkage(standardized, method="average", metric="cosine")
+
+    if num_speakers:
+        clusters = fcluster(tree, t=min(num_speakers, n_segments), criterion="maxclust")
+    else:
+        clusters = fcluster(tree, t=distance_threshold, criterion="distance")
+
+    _, first_seen, inverse = np.unique(clusters, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first_seen))
+    return order[inverse].astype(np.int16)
+
+
+def diarize_segments(
+    audio: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    num_speakers: Optional[int] = DEFAULT_NUM_SPEAKERS,
+    sr: int = SAMPLE_RATE,
+) -> np.ndarray:
+    """
+    Speaker label per segment of a decoded buffer, with segment times in
+    seconds on that buffer's timeline (a missing end runs to the next
+    segment or the end of the buffer).
+    """
+    starts = np.nan_to_num(np.asarray(starts, dtype=np.float64), nan=0.0)
+    ends = np.asarray(ends, dtype=np.float64).copy()
+    following = np.append(starts[1:], len(audio) / sr)
+    ends[np.isnan(ends)] = following[np.isnan(ends)]
+
+    return cluster_speakers(segment_embeddings(audio, starts, ends, sr), num_speakers)
@@ -0,0 +1,128 @@
+"""
+Checkpoint manifest for resumable batch runs.
+Every status change is appended to a JSONL file and fsynced, so a crashed
+run can be resumed without redoing finished work.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+PENDING = "pending"
+TRANSCRIBED = "transcribed"
+ANALYZED = "analyzed"
+FAILED = "failed"
+
+
+class RunManifest:
+    """
+    Per-file status log of a pipeline run.
+    Records are replayed on load; the last record for a file wins.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self._load()
+            mode = "a"
+        else:
+            mode = "w"
+
+        self._file = open(self.path, mode, encoding="utf-8")
+
+        # Terminate a truncated last line so new records start on their own line
+        if mode == "a" and self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line
+                    continue
+                self.entries.setdefault(record["uuid"], {}).update(record)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def register(self, audio_files: List[Tuple[str, str]]) -> None:
+        """
+        Record new (file_path, uuid) pairs as pending.
+        """
+        with self._lock:
+            for file_path, file_uuid in audio_files:
+                if file_uuid not in self.entries:
+                    record = {"uuid": file_uuid, "file_path": file_path, "status": PENDING}
+                    self.entries[file_uuid] = record
+                    self._append(record)
+
+    def mark(self, file_uuid: str, status: str, **fields: Any) -> None:
+        """
+        Record a status change, with optional extra fields such as error.
+        """
+        record = {"uuid": file_uuid, "status": status, **fields}
+        with self._lock:
+            self.entries.setdefault(file_uuid, {}).update(record)
+            self._append(record)
+
+    def outstanding(self, completed: Optional[Set[str]] = None) -> List[Tuple[str, str]]:
+        """
+        (file_path, uuid) pairs that still need work.
+        When completed is given (uuids whose results are safely on disk), it
+        decides what is finished instead of the recorded status.
+        """
+        with self._lock:
+            return [
+                (entry["file_path"], file_uuid)
+                for file_uuid, entry in self.entries.items()
+                if (
+                    file_uuid not in completed
+                    if completed is not None
+                    else entry.get("status") != ANALYZED
+                )
+            ]
+
+    def failed(self) -> Dict[str, str]:
+        """
+        Error message per file that is currently failed.
+        """
+        with self._lock:
+            return {
+                file_uuid: entry.get("error", "")
+                for file_uuid, entry in self.entries.items()
+                if entry.get("status") == FAILED
+            }
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for entry in self.entries.values():
+                status = entry.get("status", PENDING)
+                counts[status] = counts.get(status, 0) + 1
+            return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "RunManifest":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,11 +1,15 @@
-import librosa
-import jiwer
 from typing import Optional
 from pathlib import Path
 from .utils import seconds_to_hms
+from .audio_processing import probe_duration
 
 def audio_duration(audio_path: str) -> float:
-    """Get audio duration in seconds."""
+    """Get audio duration in seconds, from file metadata when possible."""
+    duration = probe_duration(audio_path)
+    if duration is not None:
+        return duration
+
+    import librosa
     audio, sr = librosa.load(audio_path, sr=None)
     return len(audio) / sr
 
@@ -15,10 +19,12 @@ def real_time_factor(duration: float, processing_time: float) -> float:
 
 def wer(reference: str, hypothesis: str) -> float:
     """Word Error Rate in percentage."""
+    import jiwer
     return jiwer.wer(reference, hypothesis) * 100
 
 def cer(reference: str, hypothesis: str) -> float:
     """Character Error Rate in percentage."""
+    import jiwer
     return jiwer.cer(reference, hypothesis) * 100
 
 
@@ -33,7 +39,10 @@ def collect_metrics(
     transcription = output["transcription"]
     processing_time = output["processing_time"]
     
-    duration = audio_duration(audio_path)
+    # Reuse the duration of the buffer the model decoded when available
+    duration = output.get("audio_duration")
+    if duration is None:
+        duration = audio_duration(audio_path)
     metrics = {
         "model_info": model_info,
         "audio_file": Path(audio_path).name,
@@ -44,6 +53,10 @@ def collect_metrics(
         "word_count": len(transcription.split()),
     }
 
+    # Share of the audio that VAD kept away from the decoder
+    if output.get("vad_skipped_ratio") is not None:
+        metrics["vad_skipped_ratio"] = round(output["vad_skipped_ratio"], 3)
+
     if reference_text:
         w = wer(reference_text, transcription)
         metrics["WER"] = round(w, 2)
@@ -3,17 +3,125 @@ Simple OpenAI API integration for sentiment analysis.
 """
 
 import os
-from openai import OpenAI
-from typing import Dict, Any, Optional
+import time
+import asyncio
+import threading
+import weakref
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from typing import Dict, Any, Optional, List, Tuple
 from models.base import getModelConfig
+from core.prompt import get_prompt, formatSmartTemplate
+from core.rate_limit import MAX_RETRIES, get_scheduler, is_retryable, retry_delay
+from core.cache import SQLiteCache, make_cache_key
 
-def getLLMModelResponse(
+# Upper bound on concurrent requests (and pooled keep-alive connections) per client
+DEFAULT_MAX_CONCURRENCY = 32
+
+# Persistent response cache so unchanged prompts are never billed twice
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite")
+LLM_CACHE_MAX_ENTRIES = 50000
+LLM_CACHE_MAX_AGE_DAYS = 90
+
+_llm_cache: Optional[SQLiteCache] = None
+_llm_cache_lock = threading.Lock()
+
+_clients: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+_clients_lock = threading.Lock()
+
+# Async clients hold connections bound to the event loop that created them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Optional[str]], AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+
+def _connection_limits(max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_concurrency,
+        max_keepalive_connections=max_concurrency,
+    )
+
+
+def _get_client(api_key: str, base_url: Optional[str] = None) -> OpenAI:
+    """
+    Get a shared OpenAI client so calls reuse pooled keep-alive connections.
+    """
+    key = (api_key, base_url)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,  # retries are paced by core.rate_limit
+                http_client=DefaultHttpxClient(limits=_connection_limits()),
+            )
+        return _clients[key]
+
+
+def _get_async_client(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get the AsyncOpenAI client shared by all calls on the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    loop_clients = _async_clients.setdefault(loop, {})
+    key = (api_key, base_url)
+    if key not in loop_clients:
+        loop_clients[key] = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,  # retries are paced by core.rate_limit
+            http_client=DefaultAsyncHttpxClient(limits=_connection_limits()),
+        )
+    return loop_clients[key]
+
+
+async def _close_async_clients() -> None:
+    """
+    Close the async clients of the running event loop before it shuts down.
+    """
+    loop_clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in loop_clients.values():
+        await client.close()
+
+
+def get_llm_cache() -> SQLiteCache:
+    """
+    Get the process-wide LLM response cache.
+    """
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = SQLiteCache(
+                LLM_CACHE_PATH,
+                table="llm_responses",
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+                max_age_seconds=LLM_CACHE_MAX_AGE_DAYS * 86400,
+            )
+        return _llm_cache
+
+
+def _cache_key(api_params: Dict[str, Any]) -> str:
+    messages = api_params["messages"]
+    return make_cache_key(
+        api_params["model"],
+        messages[0]["content"],
+        messages[1]["content"],
+        api_params["temperature"],
+    )
+
+
+def _cache_result(cache_key: str, result: Dict[str, Any]) -> None:
+    # Truncated or filtered completions are not worth replaying
+    if result["finish_reason"] == "stop":
+        get_llm_cache().set(cache_key, result)
+
+
+def _build_request(
     system_prompt: str,
     user_prompt: str,
-    model: str = "gpt-4o",
-) -> Dict[str, Any]:
+    model: str,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
-    Simple function to call OpenAI API for text analysis.
+    Validate inputs and build the chat completion parameters.
+    Returns (model_config, api_params).
     """
     model_config = getModelConfig(model)
     api_key = model_config.get("openAIApiKey")
@@ -27,17 +135,14 @@ def getLLMModelResponse(
             "OpenAI API key not provided. "
             "Set OPENAI_API_KEY environment variable."
         )
-    
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
-    
+
     # Default prompts if not provided
     if system_prompt is None or user_prompt is None:
         raise ValueError(
             "System prompt or user prompt not provided. "
             "Set system_prompt and user_prompt parameters."
         )
-    
+
 
     # Prepare API call parameters
     api_params = {
@@ -50,28 +155,173 @@ def getLLMModelResponse(
         # "max_tokens": max_tokens
         "max_completion_tokens": max_tokens
     }
-    
+
     # Add response format if specified
     if response_format:
         api_params["response_format"] = response_format
-    
-    # Call OpenAI API
-    try:
-        response = client.chat.completions.create(**api_params)
-        
+
+    return model_config, api_params
+
+
+def _prompt_text(api_params: Dict[str, Any]) -> str:
+    return "".join(message["content"] for message in api_params["messages"])
+
+
+def _parse_response(response) -> Dict[str, Any]:
+    return {
+        "content": response.choices[0].message.content,
+        "usage": {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens
+        },
+        "model": response.model,
+        "finish_reason": response.choices[0].finish_reason
+    }
+
+
+def getLLMModelResponse(
+    system_prompt: str,
+    user_prompt: str,
+    model: str = "gpt-4o",
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Simple function to call OpenAI API for text analysis.
+    Identical requests are answered from the persistent cache unless use_cache is False.
+    """
+    model_config, api_params = _build_request(system_prompt, user_prompt, model)
+
+    cache_key = _cache_key(api_params)
+    if use_cache:
+        cached = get_llm_cache().get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    # Reuse the pooled OpenAI client
+    client = _get_client(model_config.get("openAIApiKey"), model_config.get("baseURL"))
+
+    # Pace the request under the model's RPM/TPM budget
+    scheduler = get_scheduler(model)
+    estimated_tokens = scheduler.estimate_tokens(_prompt_text(api_params))
+
+    # Call OpenAI API, retrying rate limits and server errors
+    for attempt in range(MAX_RETRIES + 1):
+        scheduler.acquire(estimated_tokens)
+        try:
+            response = client.chat.completions.create(**api_params)
+        except Exception as e:
+            scheduler.release(estimated_tokens)
+            if attempt < MAX_RETRIES and is_retryable(e):
+                delay = retry_delay(attempt, e)
+                scheduler.pause(delay)
+                time.sleep(delay)
+                continue
+            raise RuntimeError(f"OpenAI API call failed: {str(e)}")
+
         # Extract and return results
-        result = {
-            "content": response.choices[0].message.content,
-            "usage": {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
-            },
-            "model": response.model,
-            "finish_reason": response.choices[0].finish_reason
-        }
-        
-        return result
-        
-    except Exception as e:
-        raise RuntimeError(f"OpenAI API call failed: {str(e)}")
+        result = _parse_response(response)
+        scheduler.record_usage(estimated_tokens, result["usage"])
+        if use_cache:
+            _cache_result(cache_key, result)
+        return {**result, "cached": False}
+
+
+async def getLLMModelResponseAsync(
+    system_prompt: str,
+    user_prompt: str,
+    model: str = "gpt-4o",
+    semaphore: Optional[asyncio.Semaphore] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Async variant of getLLMModelResponse on the shared AsyncOpenAI client.
+    When a semaphore is given, the request waits for a free slot first.
+    """
+    model_config, api_params = _build_request(system_prompt, user_prompt, model)
+
+    cache_key = _cache_key(api_params)
+    if use_cache:
+        cached = get_llm_cache().get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    client = _get_async_client(model_config.get("openAIApiKey"), model_config.get("baseURL"))
+
+    scheduler = get_scheduler(model)
+    estimated_tokens = scheduler.estimate_tokens(_prompt_text(api_params))
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            if semaphore is None:
+                await scheduler.acquire_async(estimated_tokens)
+                response = await client.chat.completions.create(**api_params)
+            else:
+                async with semaphore:
+                    await scheduler.acquire_async(estimated_tokens)
+                    response = await client.chat.completions.create(**api_params)
+        except Exception as e:
+            scheduler.release(estimated_tokens)
+            if attempt < MAX_RETRIES and is_retryable(e):
+                delay = retry_delay(attempt, e)
+                scheduler.pause(delay)
+                await asyncio.sleep(delay)
+                continue
+            raise RuntimeError(f"OpenAI API call failed: {str(e)}")
+
+        result = _parse_response(response)
+        scheduler.record_usage(estimated_tokens, result["usage"])
+        if use_cache:
+            _cache_result(cache_key, result)
+        return {**result, "cached": False}
+
+
+async def analyze_many_async(
+    transcripts: List[str],
+    model: str = "gpt-5-mini",
+    prompt_key: str = "sentiment_analysis",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze many transcripts concurrently with at most max_concurrency
+    requests in flight. Results follow the order of transcripts; a failed
+    call yields {"error": "..."} in its slot.
+    """
+    prompt = get_prompt(prompt_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def analyze(transcript: str) -> Dict[str, Any]:
+        try:
+            return await getLLMModelResponseAsync(
+                system_prompt=prompt["system_message"],
+                user_prompt=formatSmartTemplate(prompt["user_message"], {"text": transcript}),
+                model=model,
+                semaphore=semaphore,
+            )
+        except Exception as e:
+            return {"error": str(e)}
+
+    return await asyncio.gather(*(analyze(transcript) for transcript in transcripts))
+
+
+def analyze_many(
+    transcripts: List[str],
+    model: str = "gpt-5-mini",
+    prompt_key: str = "sentiment_analysis",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """
+    Blocking entry point for analyze_many_async.
+    """
+    async def run() -> List[Dict[str, Any]]:
+        try:
+            return await analyze_many_async(
+                transcripts,
+                model=model,
+                prompt_key=prompt_key,
+                max_concurrency=max_concurrency,
+            )
+        finally:
+            await _close_async_clients()
+
+    return asyncio.run(run())
@@ -0,0 +1,121 @@
+"""
+Two-stage streaming pipeline: a CPU-bound transcription stage feeding an
+I/O-bound analysis stage through a bounded queue.
+"""
+
+import queue
+import threading
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+_STOP = object()
+
+
+class StagedPipeline:
+    """
+    Run transcribe_fn on stt_executor and analyze_fn on analysis_workers
+    threads. Each stage has its own concurrency limit; when the analysis
+    queue is full the transcription stage stops taking new items
+    (backpressure), and results are yielded as soon as analysis finishes.
+    on_transcribed, if given, is called in the calling process after each
+    successful transcription.
+    """
+
+    def __init__(
+        self,
+        transcribe_fn: Callable[..., Any],
+        analyze_fn: Callable[[Any], Any],
+        error_fn: Callable[[Tuple, Exception], Any],
+        stt_executor: Executor,
+        stt_workers: int = 3,
+        analysis_workers: int = 8,
+        queue_size: int = 16,
+        on_transcribed: Optional[Callable[[Tuple, Any], None]] = None,
+    ):
+        self.transcribe_fn = transcribe_fn
+        self.analyze_fn = analyze_fn
+        self.error_fn = error_fn
+        self.stt_executor = stt_executor
+        self.stt_workers = stt_workers
+        self.analysis_workers = analysis_workers
+        self.queue_size = queue_size
+        self.on_transcribed = on_transcribed
+
+    def _stt_stage(self, items: Iterable[Tuple], transcribed: queue.Queue, results: queue.Queue) -> None:
+        in_flight = {}
+
+        def drain(return_when) -> None:
+            done, _ = wait(in_flight, return_when=return_when)
+            for future in done:
+                item = in_flight.pop(future)
+                try:
+                    transcription = future.result()
+                    if self.on_transcribed is not None:
+                        self.on_transcribed(item, transcription)
+                except Exception as e:
+                    results.put(self.error_fn(item, e))
+                    continue
+                # Blocks while the analysis stage is saturated
+                transcribed.put((item, transcription))
+
+        try:
+            for item in items:
+                if len(in_flight) >= self.stt_workers:
+                    drain(FIRST_COMPLETED)
+                try:
+                    in_flight[self.stt_executor.submit(self.transcribe_fn, *item)] = item
+                except Exception as e:
+                    results.put(self.error_fn(item, e))
+
+            while in_flight:
+                drain(FIRST_COMPLETED)
+        finally:
+            for _ in range(self.analysis_workers):
+                transcribed.put(_STOP)
+
+    def _analysis_stage(self, transcribed: queue.Queue, results: queue.Queue) -> None:
+        while True:
+            entry = transcribed.get()
+            if entry is _STOP:
+                return
+
+            item, transcription = entry
+            try:
+                results.put(self.analyze_fn(transcription))
+            except Exception as e:
+                results.put(self.error_fn(item, e))
+
+    def run(self, items: Iterable[Tuple]) -> Iterator[Any]:
+        """
+        Process items (argument tuples for transcribe_fn), yielding one
+        result per item in completion order.
+        """
+        items = list(items)
+        transcribed: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        results: queue.Queue = queue.Queue()
+
+        threads = [
+            threading.Thread(
+                target=self._stt_stage,
+                args=(items, transcribed, results),
+                name="stt-stage",
+                daemon=True,
+            )
+        ]
+        threads += [
+            threading.Thread(
+                target=self._analysis_stage,
+                args=(transcribed, results),
+                name=f"analysis-{i}",
+                daemon=True,
+            )
+            for i in range(self.analysis_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for _ in range(len(items)):
+            yield results.get()
+
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,76 @@
+"""
+Process memory and timing-statistics helpers for benchmarking.
+"""
+
+import sys
+import resource
+from typing import Dict, Iterable, Optional
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Resident set size of this process in MB (Linux only).
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def memory_breakdown_mb(pid: str = "self") -> Optional[Dict[str, float]]:
+    """
+    Resident memory of a process split into unique (private to it) and
+    shared (e.g. memory-mapped weights other workers also map) pages, in MB
+    (Linux only). pss charges each shared page in equal parts to the
+    processes mapping it, so summing pss over workers gives their real total.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    except OSError:
+        return None
+
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "unique": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+        "shared": fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0),
+    }
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(values: Iterable[float], percentiles: Iterable[int] = (50, 90, 95)) -> Dict[str, float]:
+    """
+    Mean, min, max and percentiles of a series, ignoring NaNs.
+    """
+    import numpy as np
+
+    data = np.asarray(list(values), dtype=np.float64)
+    data = data[~np.isnan(data)]
+    if data.size == 0:
+        return {}
+
+    summary = {
+        "mean": float(data.mean()),
+        "min": float(data.min()),
+        "max": float(data.max()),
+    }
+    for p in percentiles:
+        summary[f"p{p}"] = float(np.percentile(data, p))
+    return summary
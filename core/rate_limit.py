@@ -0,0 +1,198 @@
+"""
+Request and token rate limiting for LLM calls.
+Each model gets a scheduler with requests-per-minute and tokens-per-minute
+token buckets (MODELS[...]["rpm"] / ["tpm"]) and a retry policy for
+rate-limit and server errors.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from models.base import getModelConfig
+
+MAX_RETRIES = 6
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+# Completion size assumed for pacing until real usage numbers come in
+DEFAULT_COMPLETION_TOKENS = 1000
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at limit_per_minute / 60 per second.
+    Reservations may drive the balance negative; the caller then waits for
+    the deficit to refill, which keeps concurrent callers in arrival order.
+    """
+
+    def __init__(self, limit_per_minute: float):
+        self.capacity = float(limit_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount tokens and return the seconds to wait before using them.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """
+        Credit (positive) or debit (negative) tokens after the real cost is known.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimitScheduler:
+    """
+    Paces submissions for one model under its RPM and TPM budgets.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.completion_tokens = DEFAULT_COMPLETION_TOKENS
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def estimate_tokens(self, prompt_text: str) -> int:
+        """
+        Rough token cost of a request: ~4 characters per prompt token plus
+        the running average completion size.
+        """
+        return len(prompt_text) // 4 + int(self.completion_tokens)
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """
+        Reserve budget for one request and return the seconds to wait.
+        """
+        delay = max(0.0, self._paused_until - time.monotonic())
+        if self.requests:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens:
+            delay = max(delay, self.tokens.reserve(estimated_tokens))
+        return delay
+
+    def acquire(self, estimated_tokens: int) -> None:
+        delay = self.reserve(estimated_tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, estimated_tokens: int) -> None:
+        delay = self.reserve(estimated_tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, usage: Dict[str, int]) -> None:
+        """
+        Reconcile the token bucket with the usage reported by the API.
+        """
+        if self.tokens:
+            self.tokens.adjust(estimated_tokens - usage.get("total_tokens", estimated_tokens))
+        with self._lock:
+            completion = usage.get("completion_tokens")
+            if completion is not None:
+                self.completion_tokens = 0.8 * self.completion_tokens + 0.2 * completion
+
+    def release(self, estimated_tokens: int) -> None:
+        """
+        Return the tokens reserved for an attempt that failed, so a retried
+        request is charged its estimate once. The request slot stays spent.
+        """
+        if self.tokens:
+            self.tokens.adjust(estimated_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller of this model, e.g. after a 429.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(model: str) -> RateLimitScheduler:
+    """
+    Get the process-wide scheduler for a model key.
+    """
+    with _schedulers_lock:
+        if model not in _schedulers:
+            model_config = getModelConfig(model)
+            _schedulers[model] = RateLimitScheduler(
+                rpm=model_config.get("rpm"),
+                tpm=model_config.get("tpm"),
+            )
+        return _schedulers[model]
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Retry on 408/409/429, 5xx, timeouts and dropped connections.
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    return None
+
+
+def retry_delay(attempt: int, error: Exception) -> float:
+    """
+    Seconds to wait before retry number attempt + 1: the server's
+    retry-after when given, otherwise full-jitter exponential backoff.
+    """
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF_SECONDS) + random.uniform(0, 0.25)
+
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt))
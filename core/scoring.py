@@ -0,0 +1,138 @@
+"""
+Bulk WER/CER scoring for model-comparison sweeps.
+Each (reference, hypothesis) pair is aligned once per granularity
+(words, characters), with jiwer's default normalization; the edit operations of that alignment
+give the error rate and its substitution/deletion/insertion breakdown.
+Results come back as a columnar NumPy table.
+"""
+
+import os
+import re
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+from rapidfuzz.distance import Levenshtein
+
+SCORE_DTYPE = np.dtype([
+    ("ref_words", np.int32),
+    ("substitutions", np.int32),
+    ("deletions", np.int32),
+    ("insertions", np.int32),
+    ("wer", np.float64),
+    ("ref_chars", np.int32),
+    ("char_substitutions", np.int32),
+    ("char_deletions", np.int32),
+    ("char_insertions", np.int32),
+    ("cer", np.float64),
+])
+
+# Below this many pairs a process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+
+_MULTIPLE_SPACES = re.compile(r"\s\s+")
+
+
+def _words(text: str) -> List[str]:
+    # Same as jiwer's default WER transform, so rates match metrics.wer
+    return [word for word in _MULTIPLE_SPACES.sub(" ", text).strip().split(" ") if word]
+
+
+def _edit_counts(reference: Sequence, hypothesis: Sequence) -> Tuple[int, int, int]:
+    substitutions = deletions = insertions = 0
+    for op in Levenshtein.editops(reference, hypothesis):
+        if op.tag == "replace":
+            substitutions += 1
+        elif op.tag == "delete":
+            deletions += 1
+        else:
+            insertions += 1
+    return substitutions, deletions, insertions
+
+
+def _rate(errors: int, total: int) -> float:
+    return errors / total * 100 if total else float("nan")
+
+
+def score_pair(reference: str, hypothesis: str) -> tuple:
+    """
+    Score one pair; returns a row matching SCORE_DTYPE (rates in percent).
+    """
+    ref_words = _words(reference)
+    s, d, i = _edit_counts(ref_words, _words(hypothesis))
+
+    # jiwer's default CER transform only strips the ends
+    reference = reference.strip()
+    cs, cd, ci = _edit_counts(reference, hypothesis.strip())
+
+    return (
+        len(ref_words), s, d, i, _rate(s + d + i, len(ref_words)),
+        len(reference), cs, cd, ci, _rate(cs + cd + ci, len(reference)),
+    )
+
+
+def _score_chunk(pairs: List[Tuple[str, str]]) -> List[tuple]:
+    return [score_pair(reference, hypothesis) for reference, hypothesis in pairs]
+
+
+def score_pairs(
+    pairs: Sequence[Tuple[str, str]],
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> np.ndarray:
+    """
+    Score many (reference, hypothesis) pairs across a process pool.
+    Returns a structured array with one row per pair, in input order;
+    columns are read as table["wer"], table["deletions"], etc.
+    """
+    pairs = list(pairs)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(pairs) < PARALLEL_THRESHOLD:
+        rows = _score_chunk(pairs)
+    else:
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = [row for chunk_rows in executor.map(_score_chunk, chunks) for row in chunk_rows]
+
+    return np.array(rows, dtype=SCORE_DTYPE)
+
+
+def corpus_rates(table: np.ndarray) -> Tuple[float, float]:
+    """
+    Corpus-level (WER, CER) in percent: total errors over total reference length.
+    """
+    word_errors = table["substitutions"].sum() + table["deletions"].sum() + table["insertions"].sum()
+    char_errors = (
+        table["char_substitutions"].sum() + table["char_deletions"].sum() + table["char_insertions"].sum()
+    )
+    return (
+        _rate(int(word_errors), int(table["ref_words"].sum())),
+        _rate(int(char_errors), int(table["ref_chars"].sum())),
+    )
+
+
+def collect_output_pairs(
+    outputs_dir: str = "outputs",
+    transcript_dir: str = "samples/transcript",
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Pair every outputs/<model>/<stem>.txt with samples/transcript/<stem>.txt.
+    Returns (keys, pairs) where keys are (model, stem).
+    """
+    keys, pairs = [], []
+    references = {
+        path.stem: path.read_text(encoding="utf-8").strip()
+        for path in Path(transcript_dir).glob("*.txt")
+    }
+
+    for model_dir in sorted(p for p in Path(outputs_dir).iterdir() if p.is_dir()):
+        for hypothesis_path in sorted(model_dir.glob("*.txt")):
+            reference = references.get(hypothesis_path.stem)
+            if reference is None:
+                continue
+            keys.append((model_dir.name, hypothesis_path.stem))
+            pairs.append((reference, hypothesis_path.read_text(encoding="utf-8").strip()))
+
+    return keys, pairs
@@ -1,7 +1,14 @@
+import os
 import json
+import time
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator
+from .utils import hms_to_seconds
+
+RESULTS_DB_PATH = os.getenv("STT_RESULTS_DB", "outputs/results.sqlite")
 
 
 def save_transcription(
@@ -90,12 +97,14 @@ def save_sentiment_analysis_result(
 
 
 def save_combined_results(
-    results: List[Dict[str, Any]],
+    results: Iterable[Dict[str, Any]],
     model_name: str = "",
     output_dir: str = "outputs"
 ) -> Path:
     """
     Save all combined transcription and sentiment analysis results to a single JSON file.
+    Results may be any iterable (e.g. iter_jsonl_results); they are written
+    one at a time so the whole list is never held in memory.
     """
     model_dir = Path(output_dir) / model_name
     model_dir.mkdir(parents=True, exist_ok=True)
@@ -104,6 +113,372 @@ def save_combined_results(
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
     result_file = model_dir / f"{timestamp}.json"
     
-    # Save to JSON file
+    # Save to JSON file, laid out like json.dump(list, indent=2)
     with open(result_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("[")
+        for index, result in enumerate(results):
+            item = json.dumps(result, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            f.write(("," if index else "") + "\n  " + item)
+        f.write("\n]" if f.tell() > 1 else "]")
+
+    return result_file
+
+
+class JsonlResultWriter:
+    """
+    Append-only writer for one compact JSON record per line.
+    Each record is flushed right away so readers can tail the file; fsync
+    is batched every fsync_every records.
+    """
+
+    def __init__(self, path: str, append: bool = False, fsync_every: int = 20):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self._unsynced = 0
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+        # Terminate a truncated last line so new records start on their own line
+        if append and self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "JsonlResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_jsonl_results(
+    path: str,
+    follow: bool = False,
+    poll_interval: float = 1.0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield records from a JSONL results file.
+    With follow=True keep waiting for new records, like tail -f; a partially
+    written last line is only yielded once it is complete, and lines cut
+    short by a crash are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            buffer += line
+            if not buffer.endswith("\n"):
+                continue
+
+            record, buffer = buffer.strip(), ""
+            if not record:
+                continue
+            try:
+                yield json.loads(record)
+            except json.JSONDecodeError:
+                # Left behind by a crash mid-write
+                continue
+
+
+def run_id_for(result_file: str, outputs_dir: str = "outputs") -> str:
+    """
+    Run id of a results file or model directory: its path under outputs_dir
+    without the suffix (e.g. "2026-01/voxtral-mini-latest/20260225_2034").
+    """
+    path = Path(result_file)
+    if path.suffix in (".json", ".jsonl"):
+        path = path.with_suffix("")
+    try:
+        return path.relative_to(outputs_dir).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+# One row per (run, model, audio file); metrics and sentiment also keep re-runs by time
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS transcripts (
+    run_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    audio_file TEXT NOT NULL,
+    created_at TEXT,
+    text TEXT,
+    error TEXT,
+    PRIMARY KEY (run_id, model, audio_file)
+);
+CREATE TABLE IF NOT EXISTS segments (
+    run_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    audio_file TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    start REAL,
+    end REAL,
+    text TEXT,
+    speaker_id TEXT,
+    avg_logprob REAL,
+    no_speech_prob REAL,
+    PRIMARY KEY (run_id, model, audio_file, idx)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    audio_file TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    audio_duration REAL,
+    processing_time REAL,
+    rtf REAL,
+    wer REAL,
+    cer REAL,
+    accuracy REAL,
+    char_count INTEGER,
+    word_count INTEGER,
+    vad_skipped_ratio REAL,
+    load_time REAL,
+    device TEXT,
+    PRIMARY KEY (run_id, model, audio_file, created_at)
+);
+CREATE TABLE IF NOT EXISTS sentiment (
+    run_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    audio_file TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    summary TEXT,
+    category TEXT,
+    satisfaction_score INTEGER,
+    resolution TEXT,
+    PRIMARY KEY (run_id, model, audio_file, created_at)
+);
+CREATE INDEX IF NOT EXISTS transcripts_model ON transcripts (model, created_at);
+CREATE INDEX IF NOT EXISTS transcripts_audio ON transcripts (audio_file);
+CREATE INDEX IF NOT EXISTS metrics_model ON metrics (model, created_at);
+CREATE INDEX IF NOT EXISTS metrics_audio ON metrics (audio_file);
+CREATE INDEX IF NOT EXISTS sentiment_model ON sentiment (model, created_at);
+CREATE INDEX IF NOT EXISTS sentiment_audio ON sentiment (audio_file);
+CREATE INDEX IF NOT EXISTS sentiment_category ON sentiment (category);
+"""
+
+SEGMENT_COLUMNS = ("start", "end", "text", "speaker_id", "avg_logprob", "no_speech_prob")
+
+
+def _timestamp(value: Optional[datetime] = None) -> str:
+    # ISO text sorts and compares correctly in SQL (created_at >= '2026-01-01')
+    return (value or datetime.now()).isoformat(timespec="seconds")
+
+
+class ResultsStore:
+    """
+    SQLite store of transcripts, segments, metrics and sentiment results,
+    indexed by model, audio file and run for cross-run queries such as
+    average RTF and WER per model over a date range.
+    Rows are keyed by (run_id, model, audio_file[, created_at]), so writing
+    the same result twice replaces it. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = RESULTS_DB_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(RESULTS_SCHEMA)
+        self._conn.commit()
+
+    def _insert(self, table: str, row: Dict[str, Any]) -> None:
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})", tuple(row.values())
+        )
+
+    def add_run(self, run_id: str, created_at: Optional[datetime] = None, source: Optional[str] = None) -> None:
+        with self._lock:
+            self._insert("runs", {"run_id": run_id, "created_at": _timestamp(created_at), "source": source})
+            self._conn.commit()
+
+    def run_for_source(self, source: str) -> Optional[str]:
+        """
+        Run id already recorded for a results file or directory, if any.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT run_id FROM runs WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def add_transcript(
+        self,
+        run_id: str,
+        model: str,
+        audio_file: str,
+        text: Optional[str],
+        segments: Optional[Iterable[Dict[str, Any]]] = None,
+        created_at: Optional[datetime] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record a transcript and its segments (dicts as returned by
+        transcribe_audio or the Mistral API), replacing earlier segments.
+        """
+        audio_file = Path(audio_file).stem
+        key = (run_id, model, audio_file)
+        with self._lock:
+            self._insert("transcripts", {
+                "run_id": run_id,
+                "model": model,
+                "audio_file": audio_file,
+                "created_at": _timestamp(created_at),
+                "text": text,
+                "error": error,
+            })
+            self._conn.execute(
+                "DELETE FROM segments WHERE run_id = ? AND model = ? AND audio_file = ?", key
+            )
+            self._conn.executemany(
+                f"INSERT INTO segments (run_id, model, audio_file, idx, {', '.join(SEGMENT_COLUMNS)}) "
+                f"VALUES (?, ?, ?, ?{', ?' * len(SEGMENT_COLUMNS)})",
+                [
+                    key + (index,) + tuple(segment.get(column) for column in SEGMENT_COLUMNS)
+                    for index, segment in enumerate(segments or [])
+                ],
+            )
+            self._conn.commit()
+
+    def add_metrics(
+        self,
+        run_id: str,
+        model: str,
+        audio_file: str,
+        metrics: Dict[str, Any],
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Record one collect_metrics() result (durations as hh:mm:ss or seconds).
+        """
+        model_info = metrics.get("model_info") or {}
+        duration = metrics.get("audio_duration")
+        processing_time = metrics.get("processing_time")
+        with self._lock:
+            self._insert("metrics", {
+                "run_id": run_id,
+                "model": model,
+                "audio_file": Path(audio_file).stem,
+                "created_at": _timestamp(created_at),
+                "audio_duration": hms_to_seconds(duration) if duration is not None else None,
+                "processing_time": hms_to_seconds(processing_time) if processing_time is not None else None,
+                "rtf": metrics.get("rtf"),
+                "wer": metrics.get("WER", metrics.get("wer")),
+                "cer": metrics.get("CER", metrics.get("cer")),
+                "accuracy": metrics.get("accuracy"),
+                "char_count": metrics.get("char_count"),
+                "word_count": metrics.get("word_count"),
+                "vad_skipped_ratio": metrics.get("vad_skipped_ratio"),
+                "load_time": model_info.get("load_time"),
+                "device": model_info.get("device"),
+            })
+            self._conn.commit()
+
+    def add_sentiment(
+        self,
+        run_id: str,
+        model: str,
+        audio_file: str,
+        sentiment: Dict[str, Any],
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        with self._lock:
+            self._insert("sentiment", {
+                "run_id": run_id,
+                "model": model,
+                "audio_file": Path(audio_file).stem,
+                "created_at": _timestamp(created_at),
+                "summary": sentiment.get("summary"),
+                "category": sentiment.get("category"),
+                "satisfaction_score": sentiment.get("satisfaction_score"),
+                "resolution": sentiment.get("resolution"),
+            })
+            self._conn.commit()
+
+    def add_combined_results(
+        self,
+        run_id: str,
+        model: str,
+        results: Iterable[Dict[str, Any]],
+        created_at: Optional[datetime] = None,
+    ) -> int:
+        """
+        Record stt_pipeline results ({"overview": ..., "ai_overview": ...}),
+        as written by save_combined_results. Returns the number recorded.
+        """
+        count = 0
+        for result in results:
+            audio_file = result["overview"]["uuid"]
+            overview = result["ai_overview"]
+            self.add_transcript(
+                run_id,
+                model,
+                audio_file,
+                overview.get("transcription"),
+                overview.get("segments"),
+                created_at,
+                overview.get("error"),
+            )
+            if "error" not in overview:
+                self.add_sentiment(run_id, model, audio_file, overview, created_at)
+            count += 1
+        return count
+
+    def model_summary(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Per-model averages of the recorded metrics, optionally limited to
+        created_at in [since, until) (ISO dates, e.g. "2026-01-01").
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT model, COUNT(*), SUM(audio_duration), AVG(rtf), AVG(wer), AVG(cer) FROM metrics "
+                "WHERE created_at >= COALESCE(?, '') AND created_at < COALESCE(?, '9999') "
+                "GROUP BY model ORDER BY model",
+                (since, until),
+            )
+            rows = cursor.fetchall()
+        return [
+            {"model": model, "files": files, "audio_seconds": audio, "rtf": rtf, "wer": wer, "cer": cer}
+            for model, files, audio, rtf, wer, cer in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
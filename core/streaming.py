@@ -0,0 +1,136 @@
+"""
+Incremental decoding of a live audio stream.
+A StreamingSession buffers 16 kHz PCM as it arrives, re-decodes the open
+utterance for partial text at a fixed interval, and closes the utterance
+(final segments) once VAD sees enough trailing silence.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.audio_processing import detect_speech, SAMPLE_RATE
+
+
+class StreamingSession:
+    """
+    Per-connection state for live transcription.
+    feed() is called from the receiving side as frames arrive; step() runs
+    the model and may be called from a worker thread.
+    """
+
+    def __init__(
+        self,
+        model,
+        decode_interval_s: float = 1.0,
+        endpoint_silence_s: float = 0.6,
+        max_utterance_s: float = 25.0,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.decode_interval = int(decode_interval_s * sample_rate)
+        self.endpoint_silence = int(endpoint_silence_s * sample_rate)
+        self.max_utterance = int(max_utterance_s * sample_rate)
+
+        self._lock = threading.Lock()
+        self._buffer = np.empty(0, dtype=np.float32)
+        self._offset = 0  # absolute sample index of _buffer[0]
+        self._undecoded = 0
+        self._arrivals = deque()  # (absolute end sample, arrival time) per frame
+        self._last_partial = ""
+        self.latencies: List[float] = []
+
+    def feed(self, pcm: bytes) -> None:
+        """
+        Append little-endian 16-bit mono PCM.
+        """
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2").astype(np.float32) / 32768.0
+        with self._lock:
+            self._buffer = np.concatenate((self._buffer, samples))
+            self._undecoded += len(samples)
+            self._arrivals.append((self._offset + len(self._buffer), time.time()))
+
+    def ready(self) -> bool:
+        """
+        Whether enough new audio has arrived for another decode step.
+        """
+        with self._lock:
+            return self._undecoded >= self.decode_interval
+
+    def _arrival_time(self, sample: int) -> Optional[float]:
+        for end, arrived in self._arrivals:
+            if end >= sample:
+                return arrived
+        return None
+
+    def _advance(self, samples: int) -> None:
+        with self._lock:
+            self._buffer = self._buffer[samples:]
+            self._offset += samples
+            while self._arrivals and self._arrivals[0][0] <= self._offset:
+                self._arrivals.popleft()
+
+    def _final(self, audio: np.ndarray, offset: int) -> Optional[Dict]:
+        start_s = offset / self.sample_rate
+        segments = [
+            {"start": start_s + segment["start"], "end": start_s + segment["end"], "text": segment["text"]}
+            for segment in self.model.transcribe_segments(audio)
+            if segment["text"]
+        ]
+        self._last_partial = ""
+        if not segments:
+            return None
+
+        # Latency runs from the arrival of the utterance's last audio to its final text
+        arrived = self._arrival_time(offset + len(audio))
+        latency = time.time() - arrived if arrived is not None else None
+        if latency is not None:
+            self.latencies.append(latency)
+
+        return {
+            "type": "final",
+            "text": " ".join(segment["text"] for segment in segments),
+            "start": start_s,
+            "end": (offset + len(audio)) / self.sample_rate,
+            "segments": segments,
+            "latency": latency,
+        }
+
+    def step(self, flush: bool = False) -> List[Dict]:
+        """
+        Decode the open utterance and return the messages to send:
+        a "partial" while speech continues, a "final" when it ends.
+        flush=True closes whatever is buffered (end of stream).
+        """
+        with self._lock:
+            audio = self._buffer.copy()
+            offset = self._offset
+            self._undecoded = 0
+
+        if len(audio) == 0:
+            return []
+
+        regions = detect_speech(audio, self.sample_rate, min_silence_ms=300, speech_pad_ms=100)
+        if not regions:
+            # Drop silence but keep a short tail in case speech is starting
+            if len(audio) > self.endpoint_silence:
+                self._advance(len(audio) - self.endpoint_silence)
+            return []
+
+        speech_end = regions[-1][1]
+        endpoint = len(audio) - speech_end >= self.endpoint_silence
+        if flush or endpoint or len(audio) >= self.max_utterance:
+            cut = speech_end if endpoint and not flush else len(audio)
+            final = self._final(audio[:cut], offset)
+            self._advance(cut)
+            return [final] if final else []
+
+        text = " ".join(segment["text"] for segment in self.model.transcribe_segments(audio)).strip()
+        if not text or text == self._last_partial:
+            return []
+        self._last_partial = text
+        return [{"type": "partial", "text": text, "start": offset / self.sample_rate}]
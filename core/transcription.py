@@ -1,39 +1,260 @@
+import os
 import time
-from models.whisper import TransformerBasedSTTModel
-from models.faster_whisper import FasterWhisperSTT
-from models.mistral_ai import MistralAISTT
+import threading
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models import get_backend_class
 from models.base import MODELS
+from models.registry import get_registry
+from models.segments import SegmentArray
+from core.audio_processing import (
+    audio_file_hash,
+    load_audio,
+    probe_duration,
+    detect_speech,
+    extract_speech,
+    speech_to_original_time,
+    stream_audio,
+    SAMPLE_RATE,
+)
+from core.cache import SQLiteCache, make_cache_key
+from core.diarization import diarize_segments
 
-def transcribe_audio(file_path: str, model_name: str, device: str = "cpu") -> dict:
-    if model_name not in MODELS:
-        raise ValueError(
-            f"Model '{model_name}' not supported. "
-            f"Choose from {list(MODELS.keys())}"
-        )
+# Transcripts keyed by audio content hash, model key and decode parameters
+TRANSCRIPTION_CACHE_PATH = os.getenv("TRANSCRIPTION_CACHE_PATH", ".cache/transcription_cache.sqlite")
+
+# MODELS entries that do not change the decoded text
+_NON_DECODE_CONFIG_KEYS = ("api_key", "size_mb", "cpu_threads", "num_workers", "max_queue", "mmap_weights")
 
+# Transcribe only the speech regions found by voice activity detection
+VAD_ENABLED = os.getenv("STT_VAD", "1") != "0"
+
+_caches: Dict[str, SQLiteCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _build_model(
+    model_name: str,
+    device: str,
+    compute_type: Optional[str],
+    cpu_threads: Optional[int] = None,
+):
+    # Only the selected backend (and its ML framework) is imported
     model_type = MODELS[model_name]["type"]
+    backend = get_backend_class(model_type)
 
     if model_type == "faster-whisper":
-        model = FasterWhisperSTT(
+        return backend(
             model_key=model_name,
             device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
         )
     elif model_type == "mistral-ai":
-        model = MistralAISTT(
+        return backend(
             model_key=model_name,
         )
     else:
-        model = TransformerBasedSTTModel(
+        return backend(
             model_key=model_name,
             device=device,
         )
 
-    model.load_model()
 
+def get_model(
+    model_name: str,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+    cpu_threads: Optional[int] = None,
+):
+    """
+    Get a loaded model from the process-wide registry.
+    cpu_threads only applies when the model is loaded by this call.
+    Returns (model, cache_hit).
+    """
+    if model_name not in MODELS:
+        raise ValueError(
+            f"Model '{model_name}' not supported. "
+            f"Choose from {list(MODELS.keys())}"
+        )
+
+    return get_registry().get(
+        model_name,
+        lambda: _build_model(model_name, device, compute_type, cpu_threads),
+        device=device,
+        compute_type=compute_type,
+    )
+
+
+def warm_up(model, seconds: float = 1.0) -> float:
+    """
+    Run one throwaway decode on silence so lazy initialisation (kernel
+    selection, thread pools, allocator growth) happens before real traffic.
+    Goes through transcribe_segments, which decodes sequentially without
+    VAD: a batched Faster-Whisper transcribe() would find no speech in
+    silence and never run the encoder or decoder.
+    API backends are skipped. Returns the time of the decode.
+    """
+    if not getattr(model, "accepts_audio_array", False) or not hasattr(model, "transcribe_segments"):
+        return 0.0
     start = time.time()
-    transcription_result = model.transcribe(file_path)
-    processing_time = time.time() - start
+    model.transcribe_segments(np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32))
+    return time.time() - start
+
+
+def _get_cache(table: str) -> SQLiteCache:
+    with _caches_lock:
+        if table not in _caches:
+            _caches[table] = SQLiteCache(TRANSCRIPTION_CACHE_PATH, table=table)
+        return _caches[table]
+
+
+def get_transcription_cache() -> SQLiteCache:
+    """
+    Get the process-wide transcription cache.
+    """
+    return _get_cache("transcriptions")
+
+
+def _audio_hash(file_path: str) -> str:
+    # Remember the content hash per (path, size, mtime) so unchanged files are not re-read
+    stat = os.stat(file_path)
+    stat_key = make_cache_key(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    file_hashes = _get_cache("file_hashes")
+
+    cached = file_hashes.get(stat_key)
+    if cached is not None:
+        return cached["sha256"]
+
+    digest = audio_file_hash(file_path)
+    file_hashes.set(stat_key, {"sha256": digest})
+    return digest
+
+
+def _decode_params(
+    model_name: str,
+    device: str,
+    compute_type: Optional[str],
+    vad: bool = False,
+    diarize: bool = False,
+) -> Dict[str, Any]:
+    config = {
+        key: value
+        for key, value in MODELS[model_name].items()
+        if key not in _NON_DECODE_CONFIG_KEYS
+    }
+    return {
+        "config": config,
+        "device": device,
+        "compute_type": compute_type,
+        "vad": vad,
+        "diarize": diarize,
+    }
+
+
+def transcription_cache_key(
+    file_path: str,
+    model_name: str,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+    vad: bool = False,
+    diarize: bool = False,
+) -> str:
+    """
+    Cache key for a transcription; stays valid when the audio file is renamed.
+    """
+    return make_cache_key(
+        _audio_hash(file_path),
+        model_name,
+        _decode_params(model_name, device, compute_type, vad, diarize),
+    )
+
+
+def prepare_audio(model, file_path: str, vad: bool = False):
+    """
+    Decode the file once for local backends, which take the buffer directly;
+    its length doubles as the audio duration for metrics.
+    With vad=True, backends whose vad_prepass is set get only the speech
+    regions, concatenated.
+    Returns (model input, duration in seconds, speech regions or None).
+    """
+    if vad and getattr(model, "vad_prepass", True):
+        audio = load_audio(file_path)
+        regions = detect_speech(audio)
+        return extract_speech(audio, regions), len(audio) / SAMPLE_RATE, regions
+    if getattr(model, "accepts_audio_array", False):
+        audio = load_audio(file_path)
+        return audio, len(audio) / SAMPLE_RATE, None
+    return file_path, probe_duration(file_path), None
+
+
+def _remap_segments(segments, regions: List[Tuple[int, int]]):
+    # Segment times from a speech-only buffer, moved back onto the original timeline
+    if isinstance(segments, SegmentArray):
+        fields = segments.fields.copy()
+        fields["start"] = speech_to_original_time(fields["start"], regions)
+        fields["end"] = speech_to_original_time(fields["end"], regions, is_end=True)
+        return SegmentArray(fields, segments.texts, segments.speakers)
+
+    remapped = []
+    for segment in segments:
+        if isinstance(segment, dict) and segment.get("start") is not None:
+            segment = dict(segment)
+            segment["start"] = speech_to_original_time(segment["start"], regions)
+            if segment.get("end") is not None:
+                segment["end"] = speech_to_original_time(segment["end"], regions, is_end=True)
+        remapped.append(segment)
+    return remapped
+
+
+def vad_skipped_ratio(regions: Optional[List[Tuple[int, int]]], duration: Optional[float]) -> Optional[float]:
+    """
+    Fraction of the audio that VAD kept away from the decoder (None without VAD).
+    """
+    if regions is None or not duration:
+        return None
+    speech = sum(end - start for start, end in regions) / SAMPLE_RATE
+    return max(0.0, 1 - speech / duration)
+
+
+def transcribe_prepared(model, audio, regions):
+    """
+    Run the model on prepare_audio output; a file with no speech never reaches the decoder.
+    """
+    if regions is not None and not regions:
+        return ""
+    return model.transcribe(audio)
+
 
+def diarize_result(transcription_result, audio):
+    """
+    Add speaker labels to the segments of a local backend's result, using
+    the same buffer the model decoded. Other results pass through unchanged
+    (the Mistral API diarizes on its side).
+    """
+    if not isinstance(transcription_result, dict) or not isinstance(audio, np.ndarray):
+        return transcription_result
+
+    segments = transcription_result.get("segments")
+    if not isinstance(segments, SegmentArray) or not len(segments):
+        return transcription_result
+
+    speakers = diarize_segments(audio, segments.start, segments.end)
+    return {**transcription_result, "segments": segments.with_speakers(speakers)}
+
+
+def _diarize_default(model_name: str, diarize: Optional[bool]) -> bool:
+    return MODELS[model_name].get("diarize", False) if diarize is None else diarize
+
+
+def _format_result(
+    transcription_result,
+    model,
+    cache_hit: bool,
+    processing_time: float,
+    audio_duration: Optional[float] = None,
+    regions: Optional[List[Tuple[int, int]]] = None,
+) -> dict:
     # Handle both dict (with segments) and string returns
     if isinstance(transcription_result, dict):
         transcription_text = transcription_result.get("text", "")
@@ -42,9 +263,192 @@ def transcribe_audio(file_path: str, model_name: str, device: str = "cpu") -> di
         transcription_text = transcription_result
         segments = []
 
+    if regions:
+        segments = _remap_segments(segments, regions)
+    # Local backends return a SegmentArray; results are stored and cached as JSON
+    if isinstance(segments, SegmentArray):
+        segments = segments.to_dicts()
+
+    # A pooled model was loaded by an earlier call, so this call paid no load time
+    model_info = model.info()
+    model_info["cache_hit"] = cache_hit
+    if cache_hit:
+        model_info["load_time"] = 0.0
+
     return {
         "transcription": transcription_text,
         "segments": segments,
         "processing_time": processing_time,
-        "model_info": model.info(),
+        "audio_duration": audio_duration,
+        "vad_skipped_ratio": vad_skipped_ratio(regions, audio_duration),
+        "model_info": model_info,
     }
+
+
+def transcribe_audio(
+    file_path: str,
+    model_name: str,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+    use_cache: bool = True,
+    force: bool = False,
+    vad: Optional[bool] = None,
+    diarize: Optional[bool] = None,
+) -> dict:
+    """
+    Transcribe a single audio file.
+    A previous transcription of the same audio with the same model and decode
+    parameters is returned from the cache (with "cached": True) unless
+    use_cache is False; force=True re-transcribes and overwrites the entry.
+    vad defaults to VAD_ENABLED (env STT_VAD); segment times are always
+    reported on the original audio timeline. diarize (default: the MODELS
+    entry's "diarize") adds a speaker_id to local backends' segments.
+    """
+    if model_name not in MODELS:
+        raise ValueError(
+            f"Model '{model_name}' not supported. "
+            f"Choose from {list(MODELS.keys())}"
+        )
+
+    vad = VAD_ENABLED if vad is None else vad
+    diarize = _diarize_default(model_name, diarize)
+
+    cache_key = None
+    if use_cache:
+        cache_key = transcription_cache_key(file_path, model_name, device, compute_type, vad, diarize)
+        if not force:
+            cached = get_transcription_cache().get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+    model, cache_hit = get_model(model_name, device=device, compute_type=compute_type)
+
+    # Decoding stays inside the timed region so RTF remains comparable
+    start = time.time()
+    audio, duration, regions = prepare_audio(model, file_path, vad)
+    transcription_result = transcribe_prepared(model, audio, regions)
+    if diarize:
+        transcription_result = diarize_result(transcription_result, audio)
+    processing_time = time.time() - start
+
+    result = _format_result(transcription_result, model, cache_hit, processing_time, duration, regions)
+    if cache_key is not None:
+        get_transcription_cache().set(cache_key, result)
+
+    return {**result, "cached": False}
+
+
+def transcribe_audio_batch(
+    file_paths: List[str],
+    model_name: str,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+    use_cache: bool = True,
+    force: bool = False,
+    vad: Optional[bool] = None,
+    diarize: Optional[bool] = None,
+) -> List[dict]:
+    """
+    Transcribe several files in one batched call.
+    Results follow the order of file_paths; cached files are skipped and
+    the batch wall time is split evenly across the files that were decoded.
+    A file that fails (missing, undecodable, ...) gets an entry with an
+    "error" message instead of failing the whole batch.
+    """
+    if model_name not in MODELS:
+        raise ValueError(
+            f"Model '{model_name}' not supported. "
+            f"Choose from {list(MODELS.keys())}"
+        )
+
+    vad = VAD_ENABLED if vad is None else vad
+    diarize = _diarize_default(model_name, diarize)
+    results: List[Optional[dict]] = [None] * len(file_paths)
+    cache_keys: List[Optional[str]] = [None] * len(file_paths)
+    pending = []
+
+    for index, file_path in enumerate(file_paths):
+        if use_cache:
+            try:
+                cache_keys[index] = transcription_cache_key(file_path, model_name, device, compute_type, vad, diarize)
+            except Exception as e:
+                results[index] = _error_entry(file_path, e)
+                continue
+            if not force:
+                cached = get_transcription_cache().get(cache_keys[index])
+                if cached is not None:
+                    results[index] = {**cached, "cached": True}
+                    continue
+        pending.append(index)
+
+    if pending:
+        model, cache_hit = get_model(model_name, device=device, compute_type=compute_type)
+
+        start = time.time()
+        prepared = {}
+        for index in pending:
+            try:
+                prepared[index] = prepare_audio(model, file_paths[index], vad)
+            except Exception as e:
+                results[index] = _error_entry(file_paths[index], e)
+
+        # Files without any speech are left out of the batch
+        with_speech = [index for index, (_, _, regions) in prepared.items() if regions is None or regions]
+        transcription_results = {index: "" for index in prepared}
+        if with_speech:
+            inputs = [prepared[index][0] for index in with_speech]
+            try:
+                batch_results = model.transcribe_batch(inputs)
+            except Exception:
+                # Decode one by one so the input that broke the batch fails alone
+                batch_results = []
+                for audio in inputs:
+                    try:
+                        batch_results.append(model.transcribe(audio))
+                    except Exception as e:
+                        batch_results.append(e)
+            for index, transcription_result in zip(with_speech, batch_results):
+                if diarize and not isinstance(transcription_result, Exception):
+                    try:
+                        transcription_result = diarize_result(transcription_result, prepared[index][0])
+                    except Exception as e:
+                        transcription_result = e
+                transcription_results[index] = transcription_result
+        processing_time = (time.time() - start) / len(pending)
+
+        for index, transcription_result in transcription_results.items():
+            if isinstance(transcription_result, Exception):
+                results[index] = _error_entry(file_paths[index], transcription_result)
+                continue
+            _, duration, regions = prepared[index]
+            result = _format_result(transcription_result, model, cache_hit, processing_time, duration, regions)
+            if cache_keys[index] is not None:
+                get_transcription_cache().set(cache_keys[index], result)
+            results[index] = {**result, "cached": False}
+
+    return results
+
+
+def _error_entry(file_path: str, error: Exception) -> dict:
+    return {"file_path": file_path, "error": f"{type(error).__name__}: {error}"}
+
+
+def transcribe_stream(
+    file_path: str,
+    model_name: str,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+    window_s: float = 30.0,
+    overlap_s: float = 5.0,
+) -> Iterator[dict]:
+    """
+    Transcribe a long recording window by window, in bounded memory.
+    Yields {"start", "end", "text"} segments on the original timeline as
+    soon as each overlapping window is decoded; overlaps are merged so
+    every stretch of speech is yielded once.
+    """
+    model, _ = get_model(model_name, device=device, compute_type=compute_type)
+    if not hasattr(model, "transcribe_stream"):
+        raise ValueError(f"Model '{model_name}' does not support streaming transcription")
+
+    yield from model.transcribe_stream(stream_audio(file_path, window_s, overlap_s), overlap_s)
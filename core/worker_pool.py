@@ -0,0 +1,97 @@
+"""
+Process pool for CPU-bound transcription.
+Each worker process loads the model once at start-up and gets its own
+share of the CPU cores, so workers do not oversubscribe the machine.
+Transformer models loaded with mmap_weights share one copy of the weights
+across workers through the page cache.
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+
+def threads_per_worker(num_workers: int) -> int:
+    """
+    Split the available cores evenly across worker processes.
+    """
+    return max(1, (os.cpu_count() or 1) // max(num_workers, 1))
+
+
+def _worker_cores(worker_index: int, cpu_threads: int) -> Optional[List[int]]:
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+
+    available = sorted(os.sched_getaffinity(0))
+    start = (worker_index * cpu_threads) % len(available)
+    cores = available[start:start + cpu_threads]
+    return cores or None
+
+
+def _init_worker(
+    model_name: str,
+    device: str,
+    compute_type: Optional[str],
+    cpu_threads: int,
+    worker_counter,
+) -> None:
+    """
+    Pin the worker to its share of cores, cap intra-op threads and load the model.
+    """
+    with worker_counter.get_lock():
+        worker_index = worker_counter.value
+        worker_counter.value += 1
+
+    # OpenMP-based libraries read this when they create their thread pools
+    os.environ["OMP_NUM_THREADS"] = str(cpu_threads)
+
+    cores = _worker_cores(worker_index, cpu_threads)
+    if cores:
+        os.sched_setaffinity(0, cores)
+
+    try:
+        import torch
+        torch.set_num_threads(cpu_threads)
+    except ImportError:
+        pass
+
+    from core.profiling import memory_breakdown_mb
+    from core.transcription import get_model, warm_up
+
+    model, _ = get_model(
+        model_name,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+    # The first task should not pay for first-decode initialisation
+    warm_up(model)
+
+    print(f"🧵 Worker {worker_index} (pid {os.getpid()}) ready: {cpu_threads} thread(s), cores {cores}")
+    # With mmap_weights the weights count as shared once a second worker maps them
+    memory = memory_breakdown_mb()
+    if memory:
+        print(f"   💾 {memory['unique']:.0f} MB unique, {memory['shared']:.0f} MB shared, {memory['pss']:.0f} MB PSS")
+
+
+def create_process_pool(
+    model_name: str,
+    num_workers: int,
+    device: str = "cpu",
+    compute_type: Optional[str] = None,
+) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers each hold a warm copy of model_name.
+    Submitted tasks travel to the workers over the pool's call queue.
+    """
+    context = multiprocessing.get_context("spawn")
+    worker_counter = context.Value("i", 0)
+    cpu_threads = threads_per_worker(num_workers)
+
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(model_name, device, compute_type, cpu_threads, worker_counter),
+    )
@@ -1,4 +1,36 @@
-from models.whisper import TransformerBasedSTTModel
-from models.faster_whisper import FasterWhisperSTT
+"""
+STT backends are imported lazily, so importing models (or models.base for
+MODELS) does not pull in torch, transformers, faster-whisper or mistralai
+until a backend of that type is actually used.
+"""
 
-__all__ = ["TransformerBasedSTTModel", "FasterWhisperSTT"]
+from importlib import import_module
+
+# MODELS "type" -> (module, class)
+BACKENDS = {
+    "openai-whisper": ("models.whisper", "TransformerBasedSTTModel"),
+    "distil-whisper": ("models.whisper", "TransformerBasedSTTModel"),
+    "faster-whisper": ("models.faster_whisper", "FasterWhisperSTT"),
+    "mistral-ai": ("models.mistral_ai", "MistralAISTT"),
+}
+
+_EXPORTS = {class_name: module for module, class_name in BACKENDS.values()}
+
+
+def get_backend_class(model_type: str):
+    """
+    Import and return the backend class for a MODELS "type".
+    """
+    if model_type not in BACKENDS:
+        raise ValueError(f"Unsupported model type: {model_type}")
+    module, class_name = BACKENDS[model_type]
+    return getattr(import_module(module), class_name)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'models' has no attribute '{name}'")
+
+
+__all__ = ["TransformerBasedSTTModel", "FasterWhisperSTT", "MistralAISTT", "get_backend_class"]
@@ -1,9 +1,13 @@
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Tuple, Union
 from dotenv import load_dotenv
 load_dotenv()
 
+# numpy is only needed for annotations here; backends import it themselves
+if TYPE_CHECKING:
+    import numpy as np
+
 MODELS: Dict[str, Dict[str, Any]] = {
     # STT models
     # OpenAI Whisper
@@ -61,6 +65,30 @@ MODELS: Dict[str, Dict[str, Any]] = {
         "multilingual": False,
         "size_mb": 3060
     },
+
+    # Quantized CPU variants ("quantization": "int8" = dynamic int8 Linear
+    # layers, "bf16" = bfloat16 weights on CPUs with native bf16 support)
+    "whisper-small-en-int8": {
+        "model_id": "openai/whisper-small.en",
+        "type": "openai-whisper",
+        "multilingual": False,
+        "quantization": "int8",
+        "size_mb": 360
+    },
+    "whisper-medium-en-int8": {
+        "model_id": "openai/whisper-medium.en",
+        "type": "openai-whisper",
+        "multilingual": False,
+        "quantization": "int8",
+        "size_mb": 930
+    },
+    "whisper-medium-en-bf16": {
+        "model_id": "openai/whisper-medium.en",
+        "type": "openai-whisper",
+        "multilingual": False,
+        "quantization": "bf16",
+        "size_mb": 1530
+    },
     
     # Distil Whisper
     "distil-whisper-small-en": {
@@ -75,6 +103,20 @@ MODELS: Dict[str, Dict[str, Any]] = {
         "multilingual": False,
         "size_mb": 789
     }, 
+    "distil-whisper-small-en-int8": {
+        "model_id": "distil-whisper/distil-small.en",
+        "type": "distil-whisper",
+        "multilingual": False,
+        "quantization": "int8",
+        "size_mb": 200
+    },
+    "distil-whisper-medium-en-int8": {
+        "model_id": "distil-whisper/distil-medium.en",
+        "type": "distil-whisper",
+        "multilingual": False,
+        "quantization": "int8",
+        "size_mb": 360
+    },
     "distil-whisper-large-v3": {
         "model_id": "distil-whisper/distil-large-v3",
         "type": "distil-whisper",
@@ -87,31 +129,46 @@ MODELS: Dict[str, Dict[str, Any]] = {
         "model_id": "tiny.en",
         "type": "faster-whisper",
         "default_language": "en",
-        "size_mb": 78
+        "size_mb": 78,
+        "batch_size": 8,
+        "cpu_threads": 0,
+        "num_workers": 1
     },
     "faster-whisper-base": {
         "model_id": "base.en",
         "type": "faster-whisper",
         "default_language": "en",
-        "size_mb": 148
+        "size_mb": 148,
+        "batch_size": 8,
+        "cpu_threads": 0,
+        "num_workers": 1
     },
     "faster-whisper-small": {
         "model_id": "small.en",
         "type": "faster-whisper",
         "default_language": "en",
-        "size_mb": 486
+        "size_mb": 486,
+        "batch_size": 8,
+        "cpu_threads": 0,
+        "num_workers": 1
     },
     "faster-whisper-medium": {
         "model_id": "medium.en",
         "type": "faster-whisper",
         "default_language": "en",
-        "size_mb": 1530
+        "size_mb": 1530,
+        "batch_size": 8,
+        "cpu_threads": 0,
+        "num_workers": 1
     },
     "faster-whisper-large-v3": {
         "model_id": "large-v3",
         "type": "faster-whisper",
         "default_language": None,
-        "size_mb": 3090
+        "size_mb": 3090,
+        "batch_size": 8,
+        "cpu_threads": 0,
+        "num_workers": 1
     },
     
     # Mistral AI Transcription
@@ -127,9 +184,12 @@ MODELS: Dict[str, Dict[str, Any]] = {
     "o4-mini":{
         "provider": "OpenAI",
         "openAIApiKey": os.getenv("OPENAI_API_KEY"),
+        "baseURL": os.getenv("OPENAI_BASE_URL"),
         "modelName": "o4-mini",
         "temperature": 1,
         "timeout":3000000,
+        "rpm": 500,  # requests per minute for the account tier
+        "tpm": 200000,  # tokens per minute for the account tier
         "maxTokens": 100000,
         "modelKwargs": {
             "response_format": { "type": "json_object" },
@@ -138,9 +198,12 @@ MODELS: Dict[str, Dict[str, Any]] = {
     "gpt-5-mini": {
         "provider": "OpenAI",
         "openAIApiKey": os.getenv("OPENAI_API_KEY"),
+        "baseURL": os.getenv("OPENAI_BASE_URL"),
         "modelName": "gpt-5-mini",
         "temperature": 1,
         "timeout":3000000,
+        "rpm": 500,  # requests per minute for the account tier
+        "tpm": 200000,  # tokens per minute for the account tier
         "maxTokens": 128000,
         "modelKwargs": {
             "response_format": { "type": "json_object" },
@@ -149,9 +212,12 @@ MODELS: Dict[str, Dict[str, Any]] = {
     "gpt-5.2": { # BEST reasoning model
         "provider": "OpenAI",
         "openAIApiKey": os.getenv("OPENAI_API_KEY"),
+        "baseURL": os.getenv("OPENAI_BASE_URL"),
         "modelName": "gpt-5.2",
         "temperature": 1,
         "timeout":3000000,
+        "rpm": 500,  # requests per minute for the account tier
+        "tpm": 200000,  # tokens per minute for the account tier
         "maxTokens": 128000,
         "modelKwargs": {
             "response_format": { "type": "json_object" },
@@ -175,6 +241,16 @@ def getModelConfig(model_key: str) -> Dict[str, Any]:
 
 
 class AudioTranscriptionModel(ABC):
+    # Local backends take a decoded 16 kHz mono float32 buffer as well as a path
+    accepts_audio_array = True
+    sample_rate = 16000
+    # Whether prepare_audio should cut the input down to VAD speech regions;
+    # off for backends that upload files or already split on VAD themselves
+    vad_prepass = True
+
+    # A segment ending this close to a window edge is taken as cut off
+    STREAM_EDGE_S = 0.2
+
     def __init__(self, model_name: str, device: str = "cpu"):
         self.model_name = model_name
         self.device = device
@@ -188,8 +264,68 @@ class AudioTranscriptionModel(ABC):
         pass
 
     @abstractmethod
-    def transcribe(self, audio_path: str) -> str:
-        pass
+    def transcribe(self, audio: Union[str, "np.ndarray"]) -> Union[str, Dict[str, Any]]:
+        """
+        Text, or {"text", "segments"} where segments is a SegmentArray for local backends.
+        """
+
+    def transcribe_batch(self, audios: List[Union[str, "np.ndarray"]]) -> List[Any]:
+        """
+        Transcribe several audio files or buffers, returning results in input order.
+        Backends that can batch inference override this.
+        """
+        return [self.transcribe(audio) for audio in audios]
+
+    @abstractmethod
+    def transcribe_segments(self, audio: "np.ndarray") -> List[Dict[str, Any]]:
+        """
+        Timestamped segments ({"start", "end", "text"}, seconds relative to
+        the buffer) for one decoded buffer of at most one model window.
+        Backends without it (the API ones) do not subclass this class, so
+        hasattr(model, "transcribe_segments") tells whether a model can stream.
+        """
+
+    def transcribe_stream(
+        self,
+        windows: Iterable[Tuple[float, "np.ndarray"]],
+        overlap_s: float,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe overlapping (offset seconds, buffer) windows one at a time,
+        yielding segments on the original timeline as soon as each window is
+        decoded. In an overlap, segments starting before its midpoint belong
+        to the earlier window and the rest to the later one; a segment cut off
+        by the window edge is left for the next window, which sees it whole.
+        """
+        if self.model is None:
+            self.load_model()
+
+        windows = iter(windows)
+        current = next(windows, None)
+        committed = 0.0
+
+        while current is not None:
+            following = next(windows, None)
+            offset, audio = current
+            window_end = offset + len(audio) / self.sample_rate
+            next_start = window_end - overlap_s
+            cut = window_end - overlap_s / 2 if following is not None else float("inf")
+
+            for segment in self.transcribe_segments(audio):
+                start = offset + segment["start"]
+                end = offset + segment["end"]
+                if start < committed:
+                    continue
+                if following is not None:
+                    if start >= cut:
+                        break
+                    if end >= window_end - self.STREAM_EDGE_S and start >= next_start:
+                        cut = start
+                        break
+                yield {"start": start, "end": end, "text": segment["text"]}
+
+            committed = cut
+            current = following
 
     def info(self) -> Dict[str, Any]:
         return {
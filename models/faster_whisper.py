@@ -1,12 +1,19 @@
 import time
-from typing import Optional
-from faster_whisper import WhisperModel
+import numpy as np
+from typing import Optional, Union
+from faster_whisper import WhisperModel, BatchedInferencePipeline
 from models.base import AudioTranscriptionModel, MODELS
+from models.segments import SegmentArray
+from models.snapshots import resolve_model_path
 
 class FasterWhisperSTT(AudioTranscriptionModel):
     """
     Faster-Whisper Speech-to-Text Engine
     CPU-optimized (CTranslate2 based)
+
+    With a batch_size > 1 (from the MODELS entry or the constructor) audio is
+    split on VAD speech boundaries and the segments are decoded in parallel
+    batches; otherwise segments are decoded sequentially.
     """
 
     def __init__(
@@ -14,6 +21,8 @@ class FasterWhisperSTT(AudioTranscriptionModel):
         model_key: str,
         device: str = "cpu",
         compute_type: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        cpu_threads: Optional[int] = None,
     ):
         if model_key not in MODELS:
             raise ValueError(f"Unsupported model: {model_key}")
@@ -27,31 +36,81 @@ class FasterWhisperSTT(AudioTranscriptionModel):
 
         self.compute_type = compute_type
 
+        # Batched decoding and CTranslate2 threading settings
+        self.batch_size = batch_size if batch_size is not None else self.model_config.get("batch_size", 1)
+        self.cpu_threads = cpu_threads if cpu_threads is not None else self.model_config.get("cpu_threads", 0)
+        self.num_workers = self.model_config.get("num_workers", 1)
+        self.batched_pipeline = None
+
         super().__init__(
             model_name=self.model_config["model_id"],
             device=device,
         )
 
+    @property
+    def is_batched(self) -> bool:
+        return self.batch_size > 1
+
+    @property
+    def vad_prepass(self) -> bool:
+        # BatchedInferencePipeline already splits the audio with Silero VAD
+        return not self.is_batched
+
     def load_model(self) -> None:
         start = time.time()
 
+        # A prefetched snapshot loads offline; otherwise faster-whisper downloads it
         self.model = WhisperModel(
-            self.model_name,
+            resolve_model_path(self.model_key),
             device=self.device,
             compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers,
         )
 
+        if self.is_batched:
+            self.batched_pipeline = BatchedInferencePipeline(model=self.model)
+
         self.load_time = time.time() - start
 
-    def transcribe(self, audio_path: str) -> str:
+    def _decode(self, audio: Union[str, np.ndarray], batched: bool) -> SegmentArray:
         if self.model is None:
             self.load_model()
 
         language = self.model_config.get("default_language") or None
-        segments, _ = self.model.transcribe(
-            audio_path,
-            language=language,
-            beam_size=5,
+
+        if batched:
+            segments, _ = self.batched_pipeline.transcribe(
+                audio,
+                language=language,
+                beam_size=5,
+                batch_size=self.batch_size,
+            )
+        else:
+            segments, _ = self.model.transcribe(
+                audio,
+                language=language,
+                beam_size=5,
+            )
+
+        return SegmentArray.from_records(
+            (segment.start, segment.end, segment.text, segment.avg_logprob, segment.no_speech_prob)
+            for segment in segments
         )
 
-        return " ".join(segment.text for segment in segments).strip()
+    def transcribe(self, audio: Union[str, np.ndarray]) -> dict:
+        segments = self._decode(audio, batched=self.is_batched)
+        return {"text": segments.text, "segments": segments}
+
+    def transcribe_segments(self, audio: np.ndarray) -> list:
+        """
+        Timestamped segments for one streaming window, decoded sequentially.
+        """
+        return self._decode(audio, batched=False).to_dicts()
+
+    def info(self):
+        info = super().info()
+        info["compute_type"] = self.compute_type
+        info["batch_size"] = self.batch_size
+        info["cpu_threads"] = self.cpu_threads
+        return info
@@ -1,4 +1,8 @@
+import io
 import time
+import wave
+import numpy as np
+from typing import Union
 from mistralai.client import Mistral
 from mistralai.client.models import File
 from models.base import MODELS
@@ -10,6 +14,13 @@ class MistralAISTT:
     Cloud-based API with diarization support
     """
 
+    # Audio is uploaded as the original file; a decoded buffer (e.g. the
+    # speech regions left after VAD) is uploaded as 16-bit WAV instead
+    accepts_audio_array = False
+    # Uploading a re-encoded PCM WAV of the speech would cost more than the
+    # silence it removes, so the original compressed file is sent
+    vad_prepass = False
+
     def __init__(self, model_key: str):
         """
         Initialize Mistral AI STT
@@ -44,7 +55,26 @@ class MistralAISTT:
         self.model = Mistral(api_key=self.api_key)
         self.load_time = time.time() - start
 
-    def transcribe(self, audio_path: str) -> dict:
+    @staticmethod
+    def _wav_bytes(audio: np.ndarray, sample_rate: int = 16000) -> bytes:
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    def _complete(self, upload: File):
+        return self.model.audio.transcriptions.complete(
+            model=self.model_name,
+            file=upload,
+            diarize=self.diarize,
+            timestamp_granularities=self.timestamp_granularities,
+        )
+
+    def transcribe(self, audio: Union[str, np.ndarray]) -> dict:
         """
         Transcribe audio file using Mistral AI API
         """
@@ -52,23 +82,27 @@ class MistralAISTT:
             self.load_model()
 
         # Open and send audio file to Mistral AI
-        with open(audio_path, "rb") as f:
-            response = self.model.audio.transcriptions.complete(
-                model=self.model_name,
-                file=File(content=f, file_name=f.name),
-                diarize=self.diarize,
-                timestamp_granularities=self.timestamp_granularities,
-            )
+        if isinstance(audio, np.ndarray):
+            response = self._complete(File(content=self._wav_bytes(audio), file_name="speech.wav"))
+        else:
+            with open(audio, "rb") as f:
+                response = self._complete(File(content=f, file_name=f.name))
 
-            conversation_segments = [segment.model_dump() for segment in response.segments]
-           
-            # conversation_json = {"segments": conversation_segments}
-            # print(json.dumps(conversation_json, indent=2))
-        
-            return {
-                "text": response.text.strip(),
-                "segments": conversation_segments
-            }
+        conversation_segments = [segment.model_dump() for segment in response.segments]
+
+        # conversation_json = {"segments": conversation_segments}
+        # print(json.dumps(conversation_json, indent=2))
+
+        return {
+            "text": response.text.strip(),
+            "segments": conversation_segments
+        }
+
+    def transcribe_batch(self, audio_paths: list) -> list:
+        """
+        Transcribe several audio files one request at a time
+        """
+        return [self.transcribe(audio_path) for audio_path in audio_paths]
 
     def info(self):
         """Return model information"""
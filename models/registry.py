@@ -0,0 +1,108 @@
+import gc
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from models.base import MODELS
+
+# Upper bound for the combined "size_mb" of models kept resident in a process.
+DEFAULT_MEMORY_BUDGET_MB = int(os.getenv("STT_MODEL_CACHE_MB", "6144"))
+
+RegistryKey = Tuple[str, str, Optional[str]]
+
+
+class ModelRegistry:
+    """
+    Process-wide pool of loaded STT models.
+    Models are keyed by (model key, device, compute_type) and evicted in
+    least-recently-used order once the summed MODELS[...]["size_mb"] of the
+    resident models exceeds the memory budget.
+    """
+
+    def __init__(self, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+        self.memory_budget_mb = memory_budget_mb
+        self._models: "OrderedDict[RegistryKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[RegistryKey, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size_mb(model_key: str) -> int:
+        return MODELS.get(model_key, {}).get("size_mb", 0)
+
+    def _resident_mb(self) -> int:
+        return sum(self._size_mb(key[0]) for key in self._models)
+
+    def _evict_for(self, model_key: str) -> None:
+        """Drop least recently used models until model_key fits in the budget."""
+        needed = self._size_mb(model_key)
+        evicted = False
+        while self._models and self._resident_mb() + needed > self.memory_budget_mb:
+            self._models.popitem(last=False)
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def get(
+        self,
+        model_key: str,
+        factory: Callable[[], Any],
+        device: str = "cpu",
+        compute_type: Optional[str] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Return (model, cache_hit) for the given key, building and loading the
+        model with factory() on a miss. Concurrent callers asking for the same
+        key wait for a single load instead of loading it twice.
+        """
+        key = (model_key, device, compute_type)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key], True
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key], True
+
+            model = factory()
+            model.load_model()
+
+            with self._lock:
+                self._evict_for(model_key)
+                self._models[key] = model
+                self.misses += 1
+
+        return model, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+        gc.collect()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": [list(key) for key in self._models],
+                "resident_mb": self._resident_mb(),
+                "memory_budget_mb": self.memory_budget_mb,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """
+    Get the process-wide model registry.
+    """
+    return _registry
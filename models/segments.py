@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+
+# Numeric segment fields; text is kept alongside in a plain list
+SEGMENT_DTYPE = np.dtype([
+    ("start", np.float64),
+    ("end", np.float64),
+    ("avg_logprob", np.float32),
+    ("no_speech_prob", np.float32),
+])
+
+
+class SegmentArray:
+    """
+    Timestamped transcription segments backed by one structured array.
+    Columns are read as segments.start, segments.end, etc. (NaN where a
+    backend does not report a value); iterating yields one dict per segment.
+    speakers holds 0-based speaker labels once diarization has run.
+    """
+
+    __slots__ = ("fields", "texts", "speakers")
+
+    def __init__(
+        self,
+        fields: np.ndarray,
+        texts: Sequence[str],
+        speakers: Optional[np.ndarray] = None,
+    ):
+        if len(fields) != len(texts):
+            raise ValueError("fields and texts must have the same length")
+        if speakers is not None and len(speakers) != len(texts):
+            raise ValueError("speakers must have one label per segment")
+        self.fields = fields
+        self.texts = list(texts)
+        self.speakers = speakers
+
+    @classmethod
+    def from_records(cls, records: Iterable[Sequence[Any]]) -> "SegmentArray":
+        """
+        Build from (start, end, text, avg_logprob, no_speech_prob) tuples;
+        missing values may be None.
+        """
+        rows, texts = [], []
+        for start, end, text, avg_logprob, no_speech_prob in records:
+            rows.append((
+                _or_nan(start),
+                _or_nan(end),
+                _or_nan(avg_logprob),
+                _or_nan(no_speech_prob),
+            ))
+            texts.append(text.strip())
+        return cls(np.array(rows, dtype=SEGMENT_DTYPE), texts)
+
+    @property
+    def start(self) -> np.ndarray:
+        return self.fields["start"]
+
+    @property
+    def end(self) -> np.ndarray:
+        return self.fields["end"]
+
+    @property
+    def avg_logprob(self) -> np.ndarray:
+        return self.fields["avg_logprob"]
+
+    @property
+    def no_speech_prob(self) -> np.ndarray:
+        return self.fields["no_speech_prob"]
+
+    @property
+    def text(self) -> str:
+        return " ".join(text for text in self.texts if text)
+
+    def with_speakers(self, speakers: np.ndarray) -> "SegmentArray":
+        return SegmentArray(self.fields, self.texts, np.asarray(speakers))
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        row = self.fields[index]
+        segment = {
+            "start": _or_none(row["start"]),
+            "end": _or_none(row["end"]),
+            "text": self.texts[index],
+            "avg_logprob": _or_none(row["avg_logprob"]),
+            "no_speech_prob": _or_none(row["no_speech_prob"]),
+        }
+        # Same speaker naming as the Mistral API
+        if self.speakers is not None:
+            segment["speaker_id"] = f"speaker_{int(self.speakers[index]) + 1}"
+        return segment
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[index] for index in range(len(self)))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        JSON-ready list of segment dicts (None for missing values).
+        """
+        return list(self)
+
+
+def _or_nan(value: Optional[float]) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def _or_none(value) -> Optional[float]:
+    # Rounded so float32 columns do not print as -0.20000000298
+    value = float(value)
+    return None if np.isnan(value) else round(value, 6)
@@ -0,0 +1,108 @@
+"""
+Memory-mapped safetensors loading, so worker processes share one copy of
+the weights. Each file is mapped copy-on-write and tensors are views onto
+the mapping: their pages live in the OS page cache, which every process
+mapping the same file shares. A page only becomes private to a process
+if that process writes to it.
+"""
+
+import json
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+# Default (transformers) checkpoint names; sharded checkpoints list their files in the index
+SAFETENSORS_WEIGHTS = "model.safetensors"
+SAFETENSORS_INDEX = "model.safetensors.index.json"
+
+# safetensors header dtype -> torch dtype name
+SAFETENSORS_DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool",
+}
+
+
+def mmap_safetensors(path: Path) -> Dict[str, "torch.Tensor"]:
+    """
+    Tensors of one .safetensors file as views onto a copy-on-write mapping
+    of the file (no data is read until a tensor is used).
+    """
+    import torch
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    # Layout: 8-byte little-endian header size, JSON header, then raw tensor data
+    header_size = int.from_bytes(mapped[:8], "little")
+    header = json.loads(mapped[8:8 + header_size])
+    header.pop("__metadata__", None)
+    data_start = 8 + header_size
+
+    tensors = {}
+    for name, entry in header.items():
+        dtype = getattr(torch, SAFETENSORS_DTYPES[entry["dtype"]])
+        begin, end = entry["data_offsets"]
+        if end == begin:
+            tensors[name] = torch.empty(entry["shape"], dtype=dtype)
+            continue
+        # frombuffer keeps a reference to the mapping, so it outlives this function
+        tensors[name] = torch.frombuffer(
+            mapped,
+            dtype=dtype,
+            count=(end - begin) // dtype.itemsize,
+            offset=data_start + begin,
+        ).reshape(entry["shape"])
+    return tensors
+
+
+def checkpoint_files(directory: Path) -> List[Path]:
+    """
+    Weight files of the default checkpoint: the shards listed in
+    model.safetensors.index.json, else model.safetensors. Variant files
+    next to them (e.g. model.fp32.safetensors) are not part of it.
+    """
+    directory = Path(directory)
+    index_path = directory / SAFETENSORS_INDEX
+    if index_path.exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            weight_map = json.load(f)["weight_map"]
+        return [directory / name for name in sorted(set(weight_map.values()))]
+
+    if (directory / SAFETENSORS_WEIGHTS).exists():
+        return [directory / SAFETENSORS_WEIGHTS]
+    raise FileNotFoundError(f"No {SAFETENSORS_WEIGHTS} or {SAFETENSORS_INDEX} in {directory}")
+
+
+def load_shared_state_dict(
+    directory: Path,
+    dtype: "torch.dtype",
+) -> Tuple[Dict[str, "torch.Tensor"], int, int]:
+    """
+    State dict of the checkpoint in directory, memory-mapped.
+    Floating-point tensors stored in another dtype than dtype have to be
+    converted, which makes them private to the process.
+    Returns (state_dict, shared_bytes, converted_bytes).
+    """
+    state_dict = {}
+    shared_bytes = 0
+    converted_bytes = 0
+    for path in checkpoint_files(directory):
+        for name, tensor in mmap_safetensors(path).items():
+            if tensor.is_floating_point() and tensor.dtype != dtype:
+                tensor = tensor.to(dtype)
+                converted_bytes += tensor.nbytes
+            else:
+                shared_bytes += tensor.nbytes
+            state_dict[name] = tensor
+    return state_dict, shared_bytes, converted_bytes
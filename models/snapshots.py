@@ -0,0 +1,178 @@
+"""
+Local, verified model snapshots for offline workers.
+prefetch_snapshot() downloads a model's weights from the Hugging Face Hub
+into STT_MODEL_DIR, checks every file against the hub's hashes and writes
+a snapshot.json manifest. Backends load from that directory when the
+manifest exists, so workers never touch the network at start-up.
+"""
+
+import os
+import json
+import mmap
+import hashlib
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.base import MODELS
+
+MODEL_SNAPSHOT_DIR = os.getenv("STT_MODEL_DIR", ".cache/models")
+SNAPSHOT_MANIFEST = "snapshot.json"
+
+# Files each backend loads (transformers uses safetensors only; see use_safetensors=True).
+# Only the default checkpoint, single-file or sharded, not variants such as model.fp32.safetensors
+TRANSFORMERS_WEIGHTS = ["model.safetensors", "model-*-of-*.safetensors"]
+ALLOW_PATTERNS = {
+    "transformers": ["*.json", *TRANSFORMERS_WEIGHTS, "*.txt", "*.model", "*.tiktoken"],
+    "faster-whisper": ["config.json", "preprocessor_config.json", "model.bin", "tokenizer.json", "vocabulary.*"],
+}
+
+# Weight files touched by warm_page_cache
+WEIGHT_PATTERNS = (*TRANSFORMERS_WEIGHTS, "model.bin")
+
+
+def _backend(model_key: str) -> Optional[str]:
+    model_type = MODELS[model_key].get("type")
+    if model_type in ("openai-whisper", "distil-whisper"):
+        return "transformers"
+    if model_type == "faster-whisper":
+        return "faster-whisper"
+    return None
+
+
+def hub_repo_id(model_key: str) -> Optional[str]:
+    """
+    Hub repository holding the weights of a MODELS entry (None for API models).
+    Faster-Whisper size names (e.g. "base.en") map to Systran's CTranslate2
+    conversions, as in faster_whisper.utils.download_model.
+    """
+    backend = _backend(model_key)
+    model_id = MODELS[model_key]["model_id"]
+    if backend == "faster-whisper" and "/" not in model_id:
+        return f"Systran/faster-whisper-{model_id}"
+    return model_id if backend else None
+
+
+def snapshot_dir(model_key: str, cache_dir: str = MODEL_SNAPSHOT_DIR) -> Optional[Path]:
+    """
+    Local directory for a model's snapshot; entries sharing weights share it.
+    """
+    repo_id = hub_repo_id(model_key)
+    if repo_id is None:
+        return None
+    return Path(cache_dir) / repo_id.replace("/", "--")
+
+
+def resolve_model_path(model_key: str, cache_dir: str = MODEL_SNAPSHOT_DIR) -> str:
+    """
+    Prefetched snapshot directory when one exists, else the hub model id.
+    """
+    directory = snapshot_dir(model_key, cache_dir)
+    if directory is not None and (directory / SNAPSHOT_MANIFEST).exists():
+        return str(directory)
+    return MODELS[model_key]["model_id"]
+
+
+def _file_sha256(path: Path, chunk_size: int = 1 << 24) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _git_blob_sha1(path: Path) -> str:
+    # The hub identifies non-LFS files by their git blob id
+    data = path.read_bytes()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def prefetch_snapshot(model_key: str, cache_dir: str = MODEL_SNAPSHOT_DIR) -> Dict[str, Any]:
+    """
+    Download a model's files, verify them against the hub's sha256 (LFS)
+    or git blob ids, and write the manifest. Returns the manifest.
+    Raises ValueError for API models and RuntimeError on a hash mismatch.
+    """
+    from huggingface_hub import HfApi, snapshot_download
+
+    backend = _backend(model_key)
+    if backend is None:
+        raise ValueError(f"Model '{model_key}' has no downloadable weights")
+
+    repo_id = hub_repo_id(model_key)
+    directory = snapshot_dir(model_key, cache_dir)
+    patterns = ALLOW_PATTERNS[backend]
+
+    info = HfApi().model_info(repo_id, files_metadata=True)
+    snapshot_download(repo_id, revision=info.sha, local_dir=str(directory), allow_patterns=patterns)
+
+    files = {}
+    mismatched = []
+    for sibling in info.siblings:
+        if not any(fnmatch(sibling.rfilename, pattern) for pattern in patterns):
+            continue
+        path = directory / sibling.rfilename
+        sha256 = _file_sha256(path)
+        if sibling.lfs is not None:
+            valid = sha256 == sibling.lfs.sha256
+        else:
+            valid = _git_blob_sha1(path) == sibling.blob_id
+        if not valid:
+            mismatched.append(sibling.rfilename)
+        files[sibling.rfilename] = {"sha256": sha256, "size": path.stat().st_size}
+
+    if mismatched:
+        raise RuntimeError(f"{model_key}: hash mismatch for {', '.join(mismatched)}")
+
+    manifest = {"model_key": model_key, "repo_id": repo_id, "revision": info.sha, "files": files}
+    with open(directory / SNAPSHOT_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def verify_snapshot(model_key: str, cache_dir: str = MODEL_SNAPSHOT_DIR) -> List[str]:
+    """
+    Re-hash a prefetched snapshot against its manifest, offline.
+    Returns the problems found (empty when the snapshot is intact).
+    """
+    directory = snapshot_dir(model_key, cache_dir)
+    if directory is None or not (directory / SNAPSHOT_MANIFEST).exists():
+        return ["no snapshot"]
+
+    with open(directory / SNAPSHOT_MANIFEST, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    problems = []
+    for name, expected in manifest["files"].items():
+        path = directory / name
+        if not path.exists():
+            problems.append(f"missing {name}")
+        elif path.stat().st_size != expected["size"] or _file_sha256(path) != expected["sha256"]:
+            problems.append(f"corrupt {name}")
+    return problems
+
+
+def warm_page_cache(model_key: str, cache_dir: str = MODEL_SNAPSHOT_DIR) -> int:
+    """
+    Memory-map the snapshot's weight files read-only and touch every page,
+    so the next load reads them from the OS page cache instead of disk.
+    Returns the number of bytes mapped.
+    """
+    directory = snapshot_dir(model_key, cache_dir)
+    if directory is None:
+        return 0
+
+    total = 0
+    for path in directory.rglob("*"):
+        if not path.is_file() or not any(fnmatch(path.name, pattern) for pattern in WEIGHT_PATTERNS):
+            continue
+        size = path.stat().st_size
+        if size == 0:
+            continue
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+                mapped.madvise(mmap.MADV_WILLNEED)
+            for offset in range(0, size, mmap.PAGESIZE):
+                mapped[offset]
+        total += size
+    return total
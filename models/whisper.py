@@ -1,8 +1,40 @@
+import os
 import torch
 import time
-# from typing import Any
-from transformers import WhisperProcessor, WhisperForConditionalGeneration, AutoProcessor, AutoModelForSpeechSeq2Seq, pipeline
+from pathlib import Path
+import numpy as np
+from typing import List, Optional, Union
+from transformers import WhisperProcessor, WhisperForConditionalGeneration, AutoProcessor, AutoModelForSpeechSeq2Seq, AutoConfig, GenerationConfig, pipeline
 from models.base import AudioTranscriptionModel, MODELS
+from models.segments import SegmentArray
+from models.snapshots import TRANSFORMERS_WEIGHTS, resolve_model_path
+from models.shared_weights import load_shared_state_dict
+
+# Number of 30 s chunks decoded together when a MODELS entry sets no "batch_size"
+DEFAULT_BATCH_SIZE = 8
+
+# Load CPU weights as copy-on-write views of the safetensors files, so worker
+# processes on one host share them through the page cache (a "mmap_weights"
+# key in MODELS overrides this per model)
+MMAP_WEIGHTS = os.getenv("STT_MMAP_WEIGHTS", "0") != "0"
+
+# CPU flags that give native bfloat16 matmuls; elsewhere bf16 is emulated and slower than fp32
+BF16_CPU_FLAGS = ("avx512_bf16", "amx_bf16")
+
+
+def cpu_supports_bf16() -> bool:
+    """
+    Whether this CPU has native bfloat16 support (Linux /proc/cpuinfo flags).
+    """
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = line.split(":", 1)[1].split()
+                    return any(flag in flags for flag in BF16_CPU_FLAGS)
+    except OSError:
+        pass
+    return False
 
 class TransformerBasedSTTModel(AudioTranscriptionModel):
     """
@@ -10,12 +42,18 @@ class TransformerBasedSTTModel(AudioTranscriptionModel):
     CPU + GPU compatible Transformer-based STT
     """
 
-    def __init__(self, model_key: str, device: str = "cpu"):
+    def __init__(
+        self,
+        model_key: str,
+        device: str = "cpu",
+        batch_size: Optional[int] = None,
+    ):
         if model_key not in MODELS:
             raise ValueError(f"Unsupported model: {model_key}")
 
         self.model_key = model_key
         self.model_config = MODELS[model_key]
+        self.batch_size = batch_size or self.model_config.get("batch_size", DEFAULT_BATCH_SIZE)
 
         super().__init__(
             model_name=self.model_config["model_id"],
@@ -23,7 +61,23 @@ class TransformerBasedSTTModel(AudioTranscriptionModel):
         )
 
         self.is_gpu = torch.cuda.is_available() and device.startswith("cuda")
-        self.dtype = torch.float16 if self.is_gpu else torch.float32
+
+        # "quantization" only applies on CPU; GPUs already run float16
+        self.quantization = None if self.is_gpu else self.model_config.get("quantization")
+        if self.quantization == "bf16" and not cpu_supports_bf16():
+            print(f"⚠️ {model_key}: CPU has no native bfloat16 support, using float32")
+            self.quantization = None
+
+        # GPU weights are copied to device memory, so there is nothing to share
+        self.mmap_weights = not self.is_gpu and self.model_config.get("mmap_weights", MMAP_WEIGHTS)
+        self.shared_weight_mb = None
+
+        if self.is_gpu:
+            self.dtype = torch.float16
+        elif self.quantization == "bf16":
+            self.dtype = torch.bfloat16
+        else:
+            self.dtype = torch.float32
 
     def _get_pipeline_device(self) -> int:
         """
@@ -40,19 +94,20 @@ class TransformerBasedSTTModel(AudioTranscriptionModel):
     def load_model(self) -> None:
         start = time.time()
         device_id = self._get_pipeline_device()
+        # A prefetched snapshot loads offline; otherwise the hub cache is used
+        source = resolve_model_path(self.model_key)
 
         if self.model_config["type"] == "openai-whisper":
-            self.processor = WhisperProcessor.from_pretrained(self.model_name)
-            self.model = WhisperForConditionalGeneration.from_pretrained(
-                self.model_name,
-                dtype=self.dtype,
-                low_cpu_mem_usage=True,
-                use_safetensors=True,
-            )
+            processor_class, model_class = WhisperProcessor, WhisperForConditionalGeneration
         else:
-            self.processor = AutoProcessor.from_pretrained(self.model_name)
-            self.model = AutoModelForSpeechSeq2Seq.from_pretrained(
-                self.model_name,
+            processor_class, model_class = AutoProcessor, AutoModelForSpeechSeq2Seq
+
+        self.processor = processor_class.from_pretrained(source)
+        if self.mmap_weights:
+            self.model = self._load_mmap(source)
+        else:
+            self.model = model_class.from_pretrained(
+                source,
                 dtype=self.dtype,
                 low_cpu_mem_usage=True,
                 use_safetensors=True,
@@ -60,6 +115,16 @@ class TransformerBasedSTTModel(AudioTranscriptionModel):
 
         self.model.to(self.device)
 
+        if self.quantization == "int8":
+            # Linear weights are stored as int8; activations are quantized per batch at runtime.
+            # In place, so the fp32 and int8 copies are never resident together
+            torch.ao.quantization.quantize_dynamic(
+                self.model,
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+                inplace=True,
+            )
+
         self.pipeline = pipeline(
             task="automatic-speech-recognition",
             model=self.model,
@@ -73,24 +138,142 @@ class TransformerBasedSTTModel(AudioTranscriptionModel):
 
         self.load_time = time.time() - start
 
-    def transcribe(self, audio_path: str) -> str:
-        if self.pipeline is None:
-            self.load_model()
+    def _load_mmap(self, source: str):
+        """
+        Build the model on the meta device and assign the memory-mapped
+        checkpoint tensors as its parameters, so no private copy of the
+        weights is made. Only tensors stored in self.dtype stay shared;
+        int8 quantization also makes the Linear weights private.
+        """
+        directory = Path(source)
+        if not directory.is_dir():
+            from huggingface_hub import snapshot_download
+
+            directory = Path(snapshot_download(source, allow_patterns=["*.json", *TRANSFORMERS_WEIGHTS]))
+
+        config = AutoConfig.from_pretrained(directory)
+        with torch.device("meta"):
+            model = AutoModelForSpeechSeq2Seq.from_config(config)
+
+        state_dict, shared_bytes, converted_bytes = load_shared_state_dict(directory, self.dtype)
+        model.load_state_dict(state_dict, strict=False, assign=True)
+        # Tied weights (proj_out = decoder embeddings) are not stored in the checkpoint
+        model.tie_weights()
+
+        missing = [name for name, tensor in model.state_dict().items() if tensor.is_meta]
+        if missing:
+            raise RuntimeError(f"{self.model_key}: checkpoint has no weights for {', '.join(missing[:5])}")
+
+        if converted_bytes:
+            print(
+                f"⚠️ {self.model_key}: {converted_bytes / (1024 * 1024):.0f} MB of weights are stored in another "
+                f"dtype than {str(self.dtype).replace('torch.', '')} and were converted into private memory"
+            )
+        self.shared_weight_mb = shared_bytes / (1024 * 1024)
+
+        model.generation_config = GenerationConfig.from_pretrained(directory)
+        return model.eval()
 
+    def _generate_kwargs(self) -> dict:
         generate_kwargs = {}
 
         if self.model_config.get("multilingual"):
             generate_kwargs["language"] = "english"
 
-        result = self.pipeline(
-            audio_path,
-            generate_kwargs=generate_kwargs,
-            return_timestamps=False,
-        )
-        
-        print('Result =>', result)
+        return generate_kwargs
+
+    def _pipeline_input(self, audio: Union[str, np.ndarray]):
+        """
+        Paths go to the pipeline as-is; decoded buffers are tagged with their
+        sample rate so the pipeline does not decode or resample again.
+        """
+        if isinstance(audio, np.ndarray):
+            return {"raw": audio, "sampling_rate": self.processor.feature_extractor.sampling_rate}
+        return audio
 
+    @staticmethod
+    def _segments(result: dict, duration: Optional[float] = None) -> SegmentArray:
+        """
+        Segments from the timestamp chunks of a pipeline result.
+        The pipeline does not expose avg_logprob or no_speech_prob.
+        """
+        records = []
+        for chunk in result.get("chunks", []):
+            start, end = chunk["timestamp"]
+            # The last chunk may have no end timestamp
+            records.append((start or 0.0, end if end is not None else duration, chunk["text"], None, None))
+        return SegmentArray.from_records(records)
+
+    def _duration(self, audio: Union[str, np.ndarray]) -> Optional[float]:
+        """
+        Length of a buffer input in seconds. core.transcription always passes
+        buffers (accepts_audio_array); for a path the length is unknown here.
+        """
+        if isinstance(audio, np.ndarray):
+            return len(audio) / self.sample_rate
+        return None
+
+    def _result(self, result, audio: Union[str, np.ndarray], index: Optional[int] = None) -> dict:
         if not isinstance(result, dict) or "text" not in result:
-            raise RuntimeError(f"Unexpected pipeline output: {result}")
+            where = "" if index is None else f" for input {index}"
+            raise RuntimeError(f"Unexpected pipeline output{where}: {result}")
+
+        # Only the last chunk can lack an end; it then ends with the input
+        chunks = result.get("chunks") or []
+        duration = self._duration(audio) if chunks and chunks[-1]["timestamp"][1] is None else None
+        return {"text": result["text"].strip(), "segments": self._segments(result, duration)}
+
+    def _run_pipeline(self, audio: Union[str, np.ndarray]):
+        if self.pipeline is None:
+            self.load_model()
+
+        # Segment timestamps come from the same decode as the text
+        return self.pipeline(
+            self._pipeline_input(audio),
+            generate_kwargs=self._generate_kwargs(),
+            return_timestamps=True,
+        )
+
+    def transcribe(self, audio: Union[str, np.ndarray]) -> dict:
+        return self._result(self._run_pipeline(audio), audio)
+
+    def transcribe_segments(self, audio: np.ndarray) -> List[dict]:
+        """
+        Timestamped segments for a buffer of at most one 30 s window.
+        """
+        result = self._run_pipeline(audio)
+        return self._segments(result, self._duration(audio)).to_dicts()
+
+    def transcribe_batch(
+        self,
+        audios: List[Union[str, np.ndarray]],
+        batch_size: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Transcribe many files with batched generation.
+        The pipeline splits every file into 30 s chunks, pads them and packs
+        chunks from different files into the same generate call; chunk
+        outputs are stitched back per file so results follow input order.
+        """
+        if self.pipeline is None:
+            self.load_model()
+
+        if not audios:
+            return []
+
+        results = self.pipeline(
+            [self._pipeline_input(audio) for audio in audios],
+            batch_size=batch_size or self.batch_size,
+            generate_kwargs=self._generate_kwargs(),
+            return_timestamps=True,
+        )
+
+        return [self._result(result, audio, index) for index, (result, audio) in enumerate(zip(results, audios))]
 
-        return result["text"].strip()
+    def info(self):
+        info = super().info()
+        info["dtype"] = str(self.dtype).replace("torch.", "")
+        info["quantization"] = self.quantization
+        info["mmap_weights"] = self.mmap_weights
+        info["shared_weight_mb"] = self.shared_weight_mb
+        return info
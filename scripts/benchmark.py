@@ -0,0 +1,285 @@
+"""
+Offline speed and accuracy benchmark for the STT models in MODELS.
+Every model runs in its own fresh process (so load time and peak RSS are
+not polluted by other models) over the audio in samples/audio, with
+warm-up runs, repeated perf_counter timings, load vs. inference
+separation and per-file and aggregate RTF/WER percentiles. The report is
+written as JSON for regression tracking across releases.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from statistics import median
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+from models.base import MODELS
+from core.audio_processing import get_audio_files, load_reference_text, SAMPLE_RATE
+from core.profiling import current_rss_mb, memory_breakdown_mb, peak_rss_mb, summarize
+
+# Warm-up decodes use at most this much audio
+WARMUP_SECONDS = 30
+
+
+def stt_model_keys() -> list:
+    return [key for key, config in MODELS.items() if "type" in config]
+
+
+def baseline_key(model_key: str):
+    """
+    The unquantized MODELS entry for the same checkpoint as a quantized one.
+    """
+    config = MODELS[model_key]
+    for key, candidate in MODELS.items():
+        if (
+            candidate.get("model_id") == config["model_id"]
+            and candidate.get("type") == config["type"]
+            and not candidate.get("quantization")
+        ):
+            return key
+    return None
+
+
+def quantization_pairs() -> list:
+    """
+    (fp32 key, quantized key) for every quantized entry with a baseline.
+    """
+    pairs = []
+    for key, config in MODELS.items():
+        if config.get("quantization") and baseline_key(key):
+            pairs.append((baseline_key(key), key))
+    return pairs
+
+
+def compare_quantization(report_models: dict, pairs: list) -> list:
+    """
+    Speed-up, memory ratio and WER change of each quantized model against its fp32 baseline.
+    """
+    rows = []
+    for baseline, quantized in pairs:
+        base, quant = report_models.get(baseline, {}), report_models.get(quantized, {})
+        if "rtf" not in base or "rtf" not in quant:
+            continue
+        base_wer = base.get("WER", {}).get("corpus")
+        quant_wer = quant.get("WER", {}).get("corpus")
+        rows.append({
+            "baseline": baseline,
+            "model": quantized,
+            "quantization": MODELS[quantized]["quantization"],
+            "rtf": quant["rtf"].get("p50"),
+            "baseline_rtf": base["rtf"].get("p50"),
+            "speedup": base["total_inference_time"] / quant["total_inference_time"] if quant["total_inference_time"] else None,
+            "peak_rss_mb": quant["peak_rss_mb"],
+            "baseline_peak_rss_mb": base["peak_rss_mb"],
+            "wer": quant_wer,
+            "baseline_wer": base_wer,
+            "wer_delta": quant_wer - base_wer if quant_wer is not None and base_wer is not None else None,
+        })
+    return rows
+
+
+def benchmark_model(
+    model_key: str,
+    audio_files: list,
+    transcript_dir: str,
+    warmup: int,
+    repeats: int,
+    device: str,
+    vad: bool = False,
+) -> dict:
+    """
+    Benchmark one model in the current process.
+    """
+    # Imported in the benchmark process, where the model is measured
+    import numpy as np
+    from core.transcription import get_model, prepare_audio, transcribe_prepared, vad_skipped_ratio
+    from core.scoring import score_pair, corpus_rates, SCORE_DTYPE
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    model, _ = get_model(model_key, device=device)
+    load_time = time.perf_counter() - start
+    rss_loaded = current_rss_mb()
+
+    files = []
+    score_rows = []
+    for index, (file_path, _) in enumerate(audio_files):
+        start = time.perf_counter()
+        audio, duration, regions = prepare_audio(model, file_path, vad)
+        decode_time = time.perf_counter() - start
+
+        if index == 0:
+            warmup_audio = audio[:WARMUP_SECONDS * SAMPLE_RATE] if isinstance(audio, np.ndarray) else audio
+            for _ in range(warmup):
+                transcribe_prepared(model, warmup_audio, regions)
+
+        inference_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            output = transcribe_prepared(model, audio, regions)
+            inference_times.append(time.perf_counter() - start)
+
+        transcription = output.get("text", "") if isinstance(output, dict) else output
+        inference_time = median(inference_times)
+
+        file_result = {
+            "audio_file": Path(file_path).name,
+            "audio_duration": duration,
+            "decode_time": decode_time,
+            "vad_skipped_ratio": vad_skipped_ratio(regions, duration),
+            "inference_times": inference_times,
+            "inference_time": inference_time,
+            "rtf": inference_time / duration if duration else None,
+            "word_count": len(transcription.split()),
+        }
+
+        reference = load_reference_text(file_path, transcript_dir)
+        if reference:
+            row = score_pair(reference, transcription)
+            score_rows.append(row)
+            file_result["WER"] = row[SCORE_DTYPE.names.index("wer")]
+            file_result["CER"] = row[SCORE_DTYPE.names.index("cer")]
+
+        files.append(file_result)
+
+    result = {
+        "model_info": model.info(),
+        "load_time": load_time,
+        "rss_before_load_mb": rss_before,
+        "rss_after_load_mb": rss_loaded,
+        "peak_rss_mb": peak_rss_mb(),
+        "memory_mb": memory_breakdown_mb(),
+        "total_audio_duration": sum(f["audio_duration"] or 0 for f in files),
+        "total_inference_time": sum(f["inference_time"] for f in files),
+        "rtf": summarize(f["rtf"] for f in files if f["rtf"] is not None),
+        "files": files,
+    }
+
+    if score_rows:
+        table = np.array(score_rows, dtype=SCORE_DTYPE)
+        corpus_wer, corpus_cer = corpus_rates(table)
+        result["WER"] = {**summarize(table["wer"]), "corpus": corpus_wer}
+        result["CER"] = {**summarize(table["cer"]), "corpus": corpus_cer}
+
+    return result
+
+
+def environment() -> dict:
+    packages = {}
+    for package in ("torch", "transformers", "faster-whisper", "ctranslate2", "numpy"):
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "packages": packages,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark STT models for speed, memory and accuracy.")
+    parser.add_argument("--models", nargs="+", default=None, help="Model keys (default: every STT model in MODELS)")
+    parser.add_argument("--samples-dir", default="samples/audio")
+    parser.add_argument("--transcript-dir", default="samples/transcript")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed warm-up decodes per model")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed decodes per file")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--vad", action="store_true", help="Decode only VAD speech regions")
+    parser.add_argument(
+        "--quantization",
+        action="store_true",
+        help="Benchmark every quantized model next to its fp32 baseline and compare them",
+    )
+    parser.add_argument("--output-dir", default="outputs/benchmarks")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pairs = quantization_pairs() if args.quantization else []
+    if args.models:
+        model_keys = args.models
+    elif pairs:
+        model_keys = list(dict.fromkeys(key for pair in pairs for key in pair))
+    else:
+        model_keys = stt_model_keys()
+    audio_files = sorted(get_audio_files(args.samples_dir))
+
+    print(f"🎯 Benchmarking {len(model_keys)} model(s) on {len(audio_files)} file(s)")
+    print(f"Warm-up: {args.warmup}, repeats: {args.repeats}, device: {args.device}, VAD: {args.vad}\n")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": vars(args),
+        "models": {},
+    }
+
+    context = multiprocessing.get_context("spawn")
+    for model_key in model_keys:
+        print(f"🔄 {model_key}")
+        # A fresh process per model keeps load time and peak RSS independent
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            future = executor.submit(
+                benchmark_model,
+                model_key,
+                audio_files,
+                args.transcript_dir,
+                args.warmup,
+                args.repeats,
+                args.device,
+                args.vad,
+            )
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {model_key} failed: {str(e)}")
+                report["models"][model_key] = {"error": str(e)}
+                continue
+
+        report["models"][model_key] = result
+        wer = result.get("WER", {}).get("corpus")
+        print(
+            f"✅ load {result['load_time']:.2f}s | "
+            f"RTF p50 {result['rtf'].get('p50', float('nan')):.3f} p95 {result['rtf'].get('p95', float('nan')):.3f} | "
+            f"peak RSS {result['peak_rss_mb']:.0f} MB"
+            + (f" | WER {wer:.2f}%" if wer is not None else "")
+        )
+
+    if pairs:
+        report["quantization"] = compare_quantization(report["models"], pairs)
+        print(f"\n{'Model':<32} {'RTF':>7} {'fp32 RTF':>9} {'Speed-up':>9} {'RSS MB':>8} {'fp32 RSS':>9} {'ΔWER':>7}")
+        print("-" * 87)
+        for row in report["quantization"]:
+            delta = f"{row['wer_delta']:+.2f}" if row["wer_delta"] is not None else "n/a"
+            speedup = f"{row['speedup']:.2f}x" if row["speedup"] else "n/a"
+            # No RTF when every file failed or had no duration
+            rtf = f"{row['rtf']:.3f}" if row["rtf"] is not None else "n/a"
+            baseline_rtf = f"{row['baseline_rtf']:.3f}" if row["baseline_rtf"] is not None else "n/a"
+            print(
+                f"{row['model']:<32} {rtf:>7} {baseline_rtf:>9} {speedup:>9} "
+                f"{row['peak_rss_mb']:>8.0f} {row['baseline_peak_rss_mb']:>9.0f} {delta:>7}"
+            )
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_file = output_dir / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n📁 Report saved to: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+HTTP transcription service.
+Models stay resident in the process-wide registry, and concurrent requests
+for the same model are coalesced into micro-batches for
+transcribe_audio_batch.
+
+    POST /transcribe           {"file_path": "...", "model": "..."}
+    POST /transcribe?model=..  raw audio bytes (X-Filename header sets the extension)
+    GET  /metrics              queue depth and p50/p95 latency per model
+    GET  /health
+"""
+
+import os
+import json
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse, parse_qs
+
+from models.base import MODELS
+from models.registry import get_registry
+from core.audio_processing import SUPPORTED_FORMATS
+from core.batching import MicroBatcher, QueueFullError
+from core.transcription import get_model, transcribe_audio_batch
+
+
+class TranscriptionService:
+    """
+    One MicroBatcher per model, created on first use.
+    A MODELS entry may set "max_queue" to override the default queue limit.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self._batchers = {}
+        self._lock = threading.Lock()
+
+    def batcher(self, model_name: str) -> MicroBatcher:
+        with self._lock:
+            if model_name not in self._batchers:
+                config = MODELS[model_name]
+                self._batchers[model_name] = MicroBatcher(
+                    lambda file_paths: self._transcribe_batch(file_paths, model_name),
+                    max_batch_size=self.args.max_batch_size or config.get("batch_size", 8),
+                    max_wait_s=self.args.max_wait_ms / 1000,
+                    max_queue=config.get("max_queue", self.args.max_queue),
+                    name=model_name,
+                )
+            return self._batchers[model_name]
+
+    def _transcribe_batch(self, file_paths: list, model_name: str) -> list:
+        # A file that failed only fails its own request
+        return [
+            RuntimeError(result["error"]) if "error" in result else result
+            for result in transcribe_audio_batch(file_paths, model_name, device=self.args.device)
+        ]
+
+    def submit(self, file_path: str, model_name: str) -> Future:
+        return self.batcher(model_name).submit(file_path)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            batchers = dict(self._batchers)
+        return {
+            "models": {name: batcher.stats() for name, batcher in batchers.items()},
+            "registry": get_registry().stats(),
+        }
+
+
+class TranscriptionHandler(BaseHTTPRequestHandler):
+    service: TranscriptionService = None
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {"error": f"Not found: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/transcribe":
+            self._send_json(404, {"error": f"Not found: {url.path}"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        upload_path = None
+
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                request = json.loads(body or b"{}")
+                file_path = request.get("file_path")
+                model_name = request.get("model", self.service.args.default_model)
+            else:
+                # Raw audio upload; spooled to a temporary file for the batch
+                model_name = parse_qs(url.query).get("model", [self.service.args.default_model])[0]
+                suffix = Path(self.headers.get("X-Filename", "upload.wav")).suffix.lower()
+                if suffix not in SUPPORTED_FORMATS:
+                    raise ValueError(f"Unsupported audio format: {suffix}")
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+                    f.write(body)
+                    upload_path = file_path = f.name
+
+            if model_name not in MODELS or "type" not in MODELS[model_name]:
+                raise ValueError(f"Unknown STT model: {model_name}")
+            if not file_path or not os.path.isfile(file_path):
+                raise ValueError(f"Audio file not found: {file_path}")
+
+            future = self.service.submit(file_path, model_name)
+            if upload_path:
+                # A timed-out request may still be queued, so the upload goes once its batch is done
+                future.add_done_callback(lambda _, path=upload_path: os.remove(path))
+                upload_path = None
+            result = future.result(timeout=self.service.args.request_timeout)
+            self._send_json(200, result)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": str(e)})
+        except QueueFullError as e:
+            self._send_json(429, {"error": str(e)})
+        except FutureTimeoutError:
+            self._send_json(504, {"error": "Transcription timed out"})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+        finally:
+            if upload_path:
+                os.remove(upload_path)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="HTTP transcription service with request batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--default-model", default="faster-whisper-base")
+    parser.add_argument("--preload", nargs="*", default=None, help="Models to load at startup (default: --default-model)")
+    parser.add_argument("--max-batch-size", type=int, default=None, help="Default: the model's batch_size")
+    parser.add_argument("--max-wait-ms", type=float, default=50, help="How long a batch waits to fill up")
+    parser.add_argument("--max-queue", type=int, default=64, help="Queued requests per model before 429")
+    parser.add_argument("--request-timeout", type=float, default=300)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    for model_name in args.preload if args.preload is not None else [args.default_model]:
+        model, _ = get_model(model_name, device=args.device)
+        print(f"✅ {model_name} loaded in {model.load_time:.2f}s")
+
+    TranscriptionHandler.service = TranscriptionService(args)
+    server = ThreadingHTTPServer((args.host, args.port), TranscriptionHandler)
+    print(f"🌐 Serving on http://{args.host}:{args.port} (batch wait {args.max_wait_ms:g} ms, queue limit {args.max_queue})")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+One-time import of the existing outputs/ tree into the results store.
+Understands every layout the pipeline and benchmarks have written:
+- outputs/<model>/<stem>.txt and <stem>.json         transcripts (and segments)
+- outputs/<model>/<stem>_<YYYYMMDD_HHMMSS>.json        metrics
+- outputs/<model>/sentiment_analysis/<stem>_<YYYYMMDD_HHMM>.json
+- outputs/<dir>/<model>/<YYYYMMDD_HHMM>.json           combined pipeline results
+Each model directory is recorded as one run, each combined file as its own;
+combined files that stt_pipeline already recorded are skipped.
+Re-running the import replaces rows instead of duplicating them.
+"""
+
+import re
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+from core.storage import RESULTS_DB_PATH, ResultsStore, run_id_for
+
+METRICS_NAME = re.compile(r"^(?P<stem>.+)_(?P<timestamp>\d{8}_\d{6})$")
+SENTIMENT_NAME = re.compile(r"^(?P<stem>.+)_(?P<timestamp>\d{8}_\d{4})$")
+COMBINED_NAME = re.compile(r"^\d{8}_\d{4}$")
+
+
+def import_model_dir(store: ResultsStore, model_dir: Path, outputs_dir: str) -> dict:
+    """
+    Import transcripts, metrics and sentiment files of one outputs/<model> directory.
+    """
+    model = model_dir.name
+    run_id = run_id_for(model_dir, outputs_dir)
+    counts = {"transcripts": 0, "metrics": 0, "sentiment": 0}
+    first_metrics = None
+
+    # .txt first, so a <stem>.json with segments wins for the same file
+    for path in sorted(model_dir.glob("*.txt")):
+        created_at = datetime.fromtimestamp(path.stat().st_mtime)
+        store.add_transcript(run_id, model, path.stem, path.read_text(encoding="utf-8").strip(), created_at=created_at)
+        counts["transcripts"] += 1
+
+    for path in sorted(model_dir.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        match = METRICS_NAME.match(path.stem)
+        if match and isinstance(data, dict):
+            created_at = datetime.strptime(match["timestamp"], "%Y%m%d_%H%M%S")
+            audio_file = data.get("audio_file", match["stem"])
+            store.add_metrics(run_id, model, audio_file, data, created_at)
+            counts["metrics"] += 1
+            first_metrics = min(first_metrics or created_at, created_at)
+        elif isinstance(data, dict) and "text" in data:
+            created_at = datetime.fromtimestamp(path.stat().st_mtime)
+            store.add_transcript(run_id, model, path.stem, data["text"], data.get("segments"), created_at)
+            counts["transcripts"] += 1
+
+    for path in sorted((model_dir / "sentiment_analysis").glob("*.json")):
+        match = SENTIMENT_NAME.match(path.stem)
+        if not match:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        created_at = datetime.strptime(match["timestamp"], "%Y%m%d_%H%M")
+        store.add_sentiment(run_id, model, match["stem"], data.get("sentiment_analysis", {}), created_at)
+        counts["sentiment"] += 1
+
+    if any(counts.values()):
+        # Directories accumulate results over time; the run starts with its first metrics
+        store.add_run(run_id, first_metrics, source=str(model_dir.resolve()))
+    return counts
+
+
+def import_combined_file(store: ResultsStore, path: Path, outputs_dir: str) -> int:
+    """
+    Import one save_combined_results() file; the model is its parent directory.
+    """
+    source = str(path.resolve())
+    run_id = run_id_for(path, outputs_dir)
+    recorded = store.run_for_source(source)
+    if recorded is not None and recorded != run_id:
+        # Recorded by stt_pipeline under its own run id, with its metrics
+        return 0
+
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+
+    created_at = datetime.strptime(path.stem, "%Y%m%d_%H%M")
+    store.add_run(run_id, created_at, source=source)
+    return store.add_combined_results(run_id, path.parent.name, results, created_at)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import the outputs/ tree into the SQLite results store.")
+    parser.add_argument("--outputs-dir", default="outputs")
+    parser.add_argument("--db", default=RESULTS_DB_PATH, help="Results database (env STT_RESULTS_DB)")
+    parser.add_argument("--since", default=None, help="Summary start date, e.g. 2026-01-01")
+    parser.add_argument("--until", default=None, help="Summary end date (exclusive)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    totals = {"transcripts": 0, "metrics": 0, "sentiment": 0, "combined": 0}
+
+    with ResultsStore(args.db) as store:
+        for directory in sorted(p for p in Path(args.outputs_dir).rglob("*") if p.is_dir()):
+            if directory.name == "sentiment_analysis":
+                continue
+
+            for key, count in import_model_dir(store, directory, args.outputs_dir).items():
+                totals[key] += count
+
+            for path in sorted(directory.glob("*.json")):
+                if COMBINED_NAME.match(path.stem):
+                    totals["combined"] += import_combined_file(store, path, args.outputs_dir)
+
+        print(
+            f"✅ Imported {totals['transcripts']} transcript(s), {totals['metrics']} metrics file(s), "
+            f"{totals['sentiment']} sentiment result(s) and {totals['combined']} combined result(s) into {args.db}\n"
+        )
+
+        summary = store.model_summary(args.since, args.until)
+
+    print(f"{'Model':<28} {'Files':>5} {'Audio h':>8} {'RTF':>7} {'WER %':>7} {'CER %':>7}")
+    print("-" * 68)
+    for row in summary:
+        wer = f"{row['wer']:>7.2f}" if row["wer"] is not None else f"{'-':>7}"
+        cer = f"{row['cer']:>7.2f}" if row["cer"] is not None else f"{'-':>7}"
+        print(
+            f"{row['model']:<28} {row['files']:>5} {(row['audio_seconds'] or 0) / 3600:>8.2f} "
+            f"{row['rtf']:>7.3f} {wer} {cer}"
+        )
+
+
+if __name__ == "__main__":
+    main()
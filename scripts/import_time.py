@@ -0,0 +1,104 @@
+"""
+Measure how long the package's entry points take to import.
+Each module is imported in a fresh interpreter (median of several runs),
+and `python -X importtime` names the heaviest dependencies it pulls in,
+so start-up regressions show up before they reach worker processes.
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from statistics import median
+
+DEFAULT_MODULES = [
+    "models",
+    "models.base",
+    "core.openai",
+    "core.transcription",
+    "core.metrics",
+    "scripts.sentiment_analysis",
+    "scripts.stt_pipeline",
+]
+
+
+def import_time(module: str) -> dict:
+    """
+    Import time of module in a new interpreter, plus its heaviest direct
+    imports by cumulative time (from -X importtime).
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        return {"error": process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "import failed"}
+
+    total_us = 0
+    heaviest = []
+    children = []
+    for line in process.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting is two extra spaces per level; children are listed before their parent
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 1:
+            children.append((int(cumulative), name))
+        elif depth == 0:
+            # Interpreter start-up imports (site, encodings) are not part of the module
+            if name == module or name == module.split(".")[0] or module.startswith(name + "."):
+                total_us += int(cumulative)
+                heaviest.extend(children)
+            children = []
+
+    heaviest.sort(reverse=True)
+    return {
+        "import_ms": total_us / 1000,
+        "heaviest": [{"module": name, "ms": us / 1000} for us, name in heaviest[:5]],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the package entry points.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output-dir", default=None, help="Also save the report as JSON here")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    report = {}
+
+    print(f"{'Module':<30} {'Import ms':>10}  Heaviest dependencies")
+    print("-" * 90)
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(args.repeats)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            print(f"{module:<30} {'failed':>10}  {errors[0]}")
+            report[module] = {"error": errors[0]}
+            continue
+
+        import_ms = median(run["import_ms"] for run in runs)
+        heaviest = runs[-1]["heaviest"]
+        report[module] = {"import_ms": import_ms, "runs_ms": [run["import_ms"] for run in runs], "heaviest": heaviest}
+        print(f"{module:<30} {import_ms:>10.1f}  " + ", ".join(f"{h['module']} {h['ms']:.0f}" for h in heaviest[:3]))
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report_file = output_dir / f"import_time_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Report saved to: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
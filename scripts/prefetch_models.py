@@ -0,0 +1,92 @@
+"""
+Prefetch model weights so production workers start offline with
+predictable load times. For every selected model this downloads the
+weights into STT_MODEL_DIR and verifies them against the hub's hashes;
+optionally it pre-loads the weight files into the page cache (mmap) and
+runs a warm-up decode to time a cold vs. warm start.
+Run with --verify-only on a worker node to re-check a copied cache offline.
+"""
+
+import time
+import argparse
+
+from models.base import MODELS
+from models.snapshots import (
+    MODEL_SNAPSHOT_DIR,
+    hub_repo_id,
+    prefetch_snapshot,
+    snapshot_dir,
+    verify_snapshot,
+    warm_page_cache,
+)
+
+
+def local_model_keys() -> list:
+    return [key for key in MODELS if "type" in MODELS[key] and hub_repo_id(key)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download, verify and warm local STT model snapshots.")
+    parser.add_argument("--models", nargs="+", default=None, help="Model keys (default: every local STT model)")
+    parser.add_argument("--verify-only", action="store_true", help="Re-hash existing snapshots without downloading")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map the weights to pull them into the page cache")
+    parser.add_argument("--warmup", action="store_true", help="Load each model and run a warm-up decode")
+    parser.add_argument("--device", default="cpu")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    model_keys = args.models or local_model_keys()
+    failed = []
+
+    # Backends resolve snapshots from the same STT_MODEL_DIR
+    print(f"📦 {len(model_keys)} model(s) → {MODEL_SNAPSHOT_DIR}\n")
+
+    for model_key in model_keys:
+        if not hub_repo_id(model_key):
+            print(f"⏭️  {model_key}: API model, nothing to prefetch")
+            continue
+
+        try:
+            start = time.time()
+            if args.verify_only:
+                problems = verify_snapshot(model_key)
+                if problems:
+                    raise RuntimeError("; ".join(problems))
+                print(f"✅ {model_key}: snapshot intact ({time.time() - start:.1f}s)")
+            else:
+                manifest = prefetch_snapshot(model_key)
+                size_mb = sum(f["size"] for f in manifest["files"].values()) / (1024 * 1024)
+                print(
+                    f"✅ {model_key}: {len(manifest['files'])} file(s), {size_mb:.0f} MB verified "
+                    f"@ {manifest['revision'][:10]} ({time.time() - start:.1f}s)"
+                )
+
+            if args.mmap:
+                start = time.time()
+                mapped = warm_page_cache(model_key)
+                print(f"   🗺️  {mapped / (1024 * 1024):.0f} MB paged in ({time.time() - start:.1f}s)")
+
+            if args.warmup:
+                # Imported here so download-only runs do not load any ML framework
+                from core.transcription import get_model, warm_up
+
+                model, _ = get_model(model_key, device=args.device)
+                print(
+                    f"   🔥 loaded from {snapshot_dir(model_key)} in {model.load_time:.2f}s, "
+                    f"warm-up decode {warm_up(model):.2f}s"
+                )
+        except Exception as e:
+            failed.append(model_key)
+            print(f"❌ {model_key}: {str(e)}")
+
+    if failed:
+        print(f"\n⚠️ {len(failed)} model(s) failed: {', '.join(failed)}")
+        raise SystemExit(1)
+
+    print(f"\n🎉 All models ready. Point STT_MODEL_DIR at {MODEL_SNAPSHOT_DIR} on the workers and set HF_HUB_OFFLINE=1.")
+
+
+if __name__ == "__main__":
+    main()
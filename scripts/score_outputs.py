@@ -0,0 +1,42 @@
+"""
+Score every model's saved transcriptions under outputs/ against the
+reference transcripts in one bulk pass and print a per-model comparison.
+"""
+
+import argparse
+import numpy as np
+from core.scoring import collect_output_pairs, score_pairs, corpus_rates
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare WER/CER of all models under outputs/.")
+    parser.add_argument("--outputs-dir", default="outputs")
+    parser.add_argument("--transcript-dir", default="samples/transcript")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: all cores)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    keys, pairs = collect_output_pairs(args.outputs_dir, args.transcript_dir)
+    print(f"📁 Scoring {len(pairs)} transcription(s)\n")
+    if not pairs:
+        return
+
+    table = score_pairs(pairs, workers=args.workers)
+    models = np.array([model for model, _ in keys])
+
+    print(f"{'Model':<28} {'Files':>5} {'WER %':>7} {'CER %':>7} {'Sub':>6} {'Del':>6} {'Ins':>6}")
+    print("-" * 70)
+    for model in sorted(set(models)):
+        rows = table[models == model]
+        wer, cer = corpus_rates(rows)
+        print(
+            f"{model:<28} {len(rows):>5} {wer:>7.2f} {cer:>7.2f} "
+            f"{rows['substitutions'].sum():>6} {rows['deletions'].sum():>6} {rows['insertions'].sum():>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
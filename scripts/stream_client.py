@@ -0,0 +1,101 @@
+"""
+Replay audio files from samples/audio to the live transcription server at
+real-time pace (or faster) and report per-utterance latency: the time from
+sending an utterance's last audio to receiving its final transcript.
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+import numpy as np
+import websockets
+
+from core.audio_processing import get_audio_files, load_audio, SAMPLE_RATE
+from core.profiling import summarize
+
+
+async def replay_file(uri: str, file_path: str, chunk_ms: int, speed: float) -> dict:
+    audio = load_audio(file_path)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    chunk_bytes = int(SAMPLE_RATE * chunk_ms / 1000) * 2
+
+    latencies = []
+    finals = []
+    summary = {}
+
+    async with websockets.connect(uri, max_size=None) as websocket:
+        started = time.time()
+
+        async def send():
+            for position in range(0, len(pcm), chunk_bytes):
+                await websocket.send(pcm[position:position + chunk_bytes])
+                # Pace frames as a live call would deliver them
+                sent_seconds = (position + chunk_bytes) / 2 / SAMPLE_RATE
+                delay = started + sent_seconds / speed - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await websocket.send(json.dumps({"type": "end"}))
+
+        sender = asyncio.create_task(send())
+
+        async for message in websocket:
+            event = json.loads(message)
+            if event["type"] == "partial":
+                print(f"   … {event['text']}")
+            elif event["type"] == "final":
+                # When the utterance's last sample was sent, on the replay clock
+                sent_at = started + event["end"] / speed
+                latency = max(0.0, time.time() - sent_at)
+                latencies.append(latency)
+                finals.append(event["text"])
+                print(f"   ✅ [{event['start']:.1f}s–{event['end']:.1f}s] {event['text']} ({latency:.2f}s)")
+            elif event["type"] == "summary":
+                summary = event
+                break
+
+        await sender
+
+    return {
+        "audio_file": Path(file_path).name,
+        "audio_duration": len(audio) / SAMPLE_RATE,
+        "transcription": " ".join(finals),
+        "latency": summarize(latencies),
+        "server_latency": summary.get("latency", {}),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay audio files to the live transcription server.")
+    parser.add_argument("--uri", default="ws://127.0.0.1:8765")
+    parser.add_argument("--samples-dir", default="samples/audio")
+    parser.add_argument("--files", nargs="+", default=None, help="Audio files (default: all of samples-dir)")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Audio per WebSocket frame")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1.0 = real time)")
+    return parser.parse_args()
+
+
+async def run(args):
+    files = args.files or [path for path, _ in sorted(get_audio_files(args.samples_dir))]
+
+    for file_path in files:
+        print(f"\n🎧 {Path(file_path).name}")
+        result = await replay_file(args.uri, file_path, args.chunk_ms, args.speed)
+        latency = result["latency"]
+        if latency:
+            print(
+                f"⏱️ Utterance latency p50 {latency['p50']:.2f}s "
+                f"p95 {latency['p95']:.2f}s max {latency['max']:.2f}s"
+            )
+        else:
+            print("⚠️ No utterances transcribed")
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Live transcription over WebSocket.
+Clients send 16 kHz mono 16-bit little-endian PCM as binary frames and a
+{"type": "end"} text message when the call ends. The server answers with
+JSON "partial" and "final" messages while audio arrives, and a "summary"
+with per-utterance latency once the stream is closed. The model is loaded
+once at startup and kept warm for every connection.
+"""
+
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import websockets
+
+from core.transcription import get_model, warm_up
+from core.streaming import StreamingSession
+from core.profiling import summarize
+
+
+async def handle_connection(websocket, model, executor, args):
+    loop = asyncio.get_running_loop()
+    session = StreamingSession(
+        model,
+        decode_interval_s=args.decode_interval,
+        endpoint_silence_s=args.endpoint_silence,
+    )
+    audio_ready = asyncio.Event()
+    ended = asyncio.Event()
+
+    async def receive():
+        # Frames are buffered as they arrive, even while a decode is running
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    session.feed(message)
+                    if session.ready():
+                        audio_ready.set()
+                elif json.loads(message).get("type") == "end":
+                    break
+        finally:
+            ended.set()
+            audio_ready.set()
+
+    async def decode():
+        while not ended.is_set():
+            await audio_ready.wait()
+            audio_ready.clear()
+            if ended.is_set():
+                break
+            for message in await loop.run_in_executor(executor, session.step):
+                await websocket.send(json.dumps(message))
+
+        for message in await loop.run_in_executor(executor, session.step, True):
+            await websocket.send(json.dumps(message))
+
+    receiver = asyncio.create_task(receive())
+    try:
+        await decode()
+        await websocket.send(json.dumps({
+            "type": "summary",
+            "utterances": len(session.latencies),
+            "latency": summarize(session.latencies),
+        }))
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        receiver.cancel()
+
+    if session.latencies:
+        latency = summarize(session.latencies)
+        print(f"📞 Stream closed: {len(session.latencies)} utterance(s), latency p50 {latency['p50']:.2f}s p95 {latency['p95']:.2f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="WebSocket server for live transcription.")
+    parser.add_argument("--model", default="faster-whisper-base")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--decode-interval", type=float, default=1.0, help="Seconds of new audio between partials")
+    parser.add_argument("--endpoint-silence", type=float, default=0.6, help="Trailing silence that ends an utterance")
+    parser.add_argument("--decode-workers", type=int, default=2, help="Concurrent decodes across connections")
+    return parser.parse_args()
+
+
+async def serve(args):
+    # Loaded once here, so the first call does not pay the load time
+    model, _ = get_model(args.model, device=args.device)
+    if not hasattr(model, "transcribe_segments"):
+        raise ValueError(f"Model '{args.model}' does not support incremental decoding")
+    # One throwaway decode so the first utterance does not pay for lazy initialisation
+    warm_up(model)
+
+    executor = ThreadPoolExecutor(max_workers=args.decode_workers)
+    print(f"✅ {args.model} loaded in {model.load_time:.2f}s")
+    print(f"🎙️ Listening on ws://{args.host}:{args.port}")
+
+    async with websockets.serve(
+        lambda websocket: handle_connection(websocket, model, executor, args),
+        args.host,
+        args.port,
+        max_size=None,
+    ):
+        await asyncio.Future()
+
+
+def main():
+    asyncio.run(serve(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
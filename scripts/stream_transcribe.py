@@ -0,0 +1,57 @@
+"""
+Transcribe a long recording window by window, printing each segment as it
+is decoded. Memory stays bounded by the window size, so multi-hour files
+work, and the first text arrives after one window instead of the full decode.
+"""
+
+import time
+import argparse
+from core.utils import seconds_to_hms
+from core.transcription import transcribe_stream
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Streaming transcription of a long audio file.")
+    parser.add_argument("audio_file")
+    parser.add_argument("--model", default="whisper-base-en")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--window", type=float, default=30.0, help="Window length in seconds")
+    parser.add_argument("--overlap", type=float, default=5.0, help="Overlap between windows in seconds")
+    parser.add_argument("--output", default=None, help="Also write the transcript to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print(f"🎧 Streaming {args.audio_file} with {args.model} ({args.window:g}s windows, {args.overlap:g}s overlap)\n")
+
+    start = time.time()
+    first_text_at = None
+    texts = []
+
+    for segment in transcribe_stream(
+        args.audio_file,
+        args.model,
+        device=args.device,
+        window_s=args.window,
+        overlap_s=args.overlap,
+    ):
+        if first_text_at is None:
+            first_text_at = time.time() - start
+        texts.append(segment["text"])
+        print(f"[{seconds_to_hms(segment['start'])} → {seconds_to_hms(segment['end'])}] {segment['text']}")
+
+    total_time = time.time() - start
+    print(f"\n✅ {len(texts)} segment(s) in {seconds_to_hms(total_time)}")
+    if first_text_at is not None:
+        print(f"⏱️ First text after {first_text_at:.2f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(" ".join(texts).strip())
+        print(f"📁 Transcript saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
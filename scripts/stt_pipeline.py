@@ -1,130 +1,258 @@
 from core.audio_processing import load_reference_text, get_audio_files
 from core.transcription import transcribe_audio
-from core.storage import save_combined_results
+from core.storage import save_combined_results, JsonlResultWriter, iter_jsonl_results, ResultsStore, RESULTS_DB_PATH, run_id_for
 from core.metrics import collect_metrics
-from core.openai import getLLMModelResponse
+from core.openai import getLLMModelResponse, get_llm_cache
 from core.prompt import get_prompt, formatSmartTemplate
+from core.worker_pool import create_process_pool
+from core.pipeline import StagedPipeline
+from core.manifest import RunManifest, TRANSCRIBED, ANALYZED, FAILED
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import json
 
 
-def process_single_file(file_path: str, file_uuid: str, model_name: str) -> dict:
+def transcribe_file(file_path: str, file_uuid: str, model_name: str, force: bool = False) -> dict:
     """
-    Process a single audio file: transcribe and analyze sentiment.
-    Returns a dictionary with the combined results.
+    STT stage: transcribe a single audio file.
+    Files already transcribed with the same model come from the transcription
+    cache unless force is True.
     """
     print(f"\n{'='*60}")
     print(f"Processing: {file_uuid}")
     print(f"File path: {file_path}")
     print(f"{'='*60}")
-    
-    try:
-        # Transcribe audio
-        result = transcribe_audio(
-            file_path=file_path,
-            model_name=model_name
-        )
+
+    result = transcribe_audio(
+        file_path=file_path,
+        model_name=model_name,
+        force=force,
+    )
+    transcribed = {
+        "uuid": file_uuid,
+        "transcription": result["transcription"],
+        "segments": result.get("segments", []),
+    }
+    if result.get("cached"):
+        print(f"⏭️  Using cached transcription for {file_uuid}")
+    else:
         print(f"✅ Transcription complete for {file_uuid}")
-        
-        # Sentiment analysis with OpenAI
-        print(f"🔄 Starting sentiment analysis for {file_uuid}")
-        
-        # Get prompts from centralized configuration
-        prompt = get_prompt("sentiment_analysis")
-        
-        # Format user message with transcription text
-        formatted_user_message = formatSmartTemplate(
-            prompt["user_message"],
-            {"text": result["transcription"]}
-        )
-        
-        result_sentiment = getLLMModelResponse(
-            system_prompt=prompt["system_message"],
-            user_prompt=formatted_user_message,
-            model="gpt-5-mini",
-        )
-        
-        # Parse the JSON response
-        sentiment_data = json.loads(result_sentiment["content"])
-        
-        print(f"✅ Sentiment analysis complete for {file_uuid}")
-        
-        # Return combined result
-        return {
-            "overview": {
-                "uuid": file_uuid
-            },
-            "ai_overview": {
-                "transcription": result["transcription"],
-                "segments": result.get("segments", []),
-                "summary": sentiment_data.get("summary", ""),
-                "category": sentiment_data.get("category", ""),
-                "satisfaction_score": sentiment_data.get("satisfaction_score", 0),
-                "resolution": sentiment_data.get("resolution", "")
-            }
-        }
+        # Cached results were not decoded in this run, so only fresh ones are measured
+        try:
+            transcribed["metrics"] = collect_metrics(file_path, result, load_reference_text(file_path))
+        except Exception as e:
+            print(f"⚠️ Metrics unavailable for {file_uuid}: {str(e)}")
+
+    return transcribed
+
+
+def analyze_transcription(transcribed: dict) -> dict:
+    """
+    Analysis stage: run sentiment analysis on a transcription.
+    Returns a dictionary with the combined results.
+    """
+    file_uuid = transcribed["uuid"]
+
+    # Sentiment analysis with OpenAI
+    print(f"🔄 Starting sentiment analysis for {file_uuid}")
+    
+    # Get prompts from centralized configuration
+    prompt = get_prompt("sentiment_analysis")
+    
+    # Format user message with transcription text
+    formatted_user_message = formatSmartTemplate(
+        prompt["user_message"],
+        {"text": transcribed["transcription"]}
+    )
     
+    result_sentiment = getLLMModelResponse(
+        system_prompt=prompt["system_message"],
+        user_prompt=formatted_user_message,
+        model="gpt-5-mini",
+    )
+    
+    # Parse the JSON response
+    sentiment_data = json.loads(result_sentiment["content"])
+    
+    print(f"✅ Sentiment analysis complete for {file_uuid}")
+    
+    # Return combined result
+    return {
+        "overview": {
+            "uuid": file_uuid
+        },
+        "ai_overview": {
+            "transcription": transcribed["transcription"],
+            "segments": transcribed["segments"],
+            "summary": sentiment_data.get("summary", ""),
+            "category": sentiment_data.get("category", ""),
+            "satisfaction_score": sentiment_data.get("satisfaction_score", 0),
+            "resolution": sentiment_data.get("resolution", "")
+        }
+    }
+
+
+def error_result(item: tuple, error: Exception) -> dict:
+    """
+    Build the result entry for a file that failed in either stage.
+    """
+    file_uuid = item[1]
+    print(f"❌ Error processing {file_uuid}: {str(error)}")
+    return {
+        "overview": {
+            "uuid": file_uuid
+        },
+        "ai_overview": {
+            "error": str(error)
+        }
+    }
+
+
+def process_single_file(file_path: str, file_uuid: str, model_name: str) -> dict:
+    """
+    Process a single audio file: transcribe and analyze sentiment.
+    Returns a dictionary with the combined results.
+    """
+    try:
+        return analyze_transcription(transcribe_file(file_path, file_uuid, model_name))
     except Exception as e:
-        print(f"❌ Error processing {file_uuid}: {str(e)}")
-        return {
-            "overview": {
-                "uuid": file_uuid
-            },
-            "ai_overview": {
-                "error": str(e)
+        return error_result((file_path, file_uuid, model_name), e)
+
+
+def combined_results(results_path: str, failed: dict):
+    """
+    Yield each streamed result once, followed by error entries for failed files.
+    """
+    seen = set()
+    for result in iter_jsonl_results(results_path):
+        file_uuid = result["overview"]["uuid"]
+        if file_uuid not in seen:
+            seen.add(file_uuid)
+            yield result
+
+    for file_uuid, error in failed.items():
+        if file_uuid not in seen:
+            yield {
+                "overview": {"uuid": file_uuid},
+                "ai_overview": {"error": error},
             }
-        }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Transcribe and analyze a folder of call recordings.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the previous run from its manifest, skipping files that already finished.",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     # Configuration
     samples_dir = "samples/audio/2026-01"
     model_name = "voxtral-mini-latest"
     output_dir = "outputs/2026-01"
-    max_workers = 3  # Number of parallel workers
+    stt_workers = 3  # Number of parallel transcription workers
+    analysis_workers = 8  # Number of concurrent sentiment analysis calls
+    queue_size = 16  # Transcripts waiting for analysis before STT pauses
+    # "thread": workers share one process (suits cloud models such as voxtral)
+    # "process": one process per worker, each with a warm model and its own share of cores
+    execution_mode = "thread"
+    force_transcription = False  # Re-transcribe files already in the transcription cache
+    manifest_path = Path(output_dir) / model_name / "run_manifest.jsonl"
+    # Results are streamed here as each file completes
+    results_path = Path(output_dir) / model_name / "run_results.jsonl"
     
-    print(f"🎯 Starting STT Pipeline with {max_workers} parallel workers")
+    # Runs are told apart by their start time, to the second
+    run_started = datetime.now()
+    run_id = f"{run_id_for(str(Path(output_dir) / model_name))}/{run_started.strftime('%Y%m%d_%H%M%S')}"
+
+    print(f"🎯 Starting STT Pipeline with {stt_workers} {execution_mode} STT workers and {analysis_workers} analysis workers")
     print(f"Model: {model_name}")
     print(f"Audio directory: {samples_dir}\n")
     
     # Load all audio files from folder
     audio_files = get_audio_files(samples_dir)
     print(f"📁 Found {len(audio_files)} audio file(s) to process\n")
+
+    # Every status change is checkpointed so the run can be resumed after a crash
+    manifest = RunManifest(str(manifest_path), resume=args.resume)
+    manifest.register(audio_files)
+    completed = None
+    if args.resume and results_path.exists():
+        # Only results that reached the results file count as done
+        completed = {result["overview"]["uuid"] for result in iter_jsonl_results(str(results_path))}
+    pending_files = manifest.outstanding(completed)
+    if args.resume:
+        print(f"♻️  Resuming run: {manifest.counts()}, {len(pending_files)} file(s) outstanding\n")
+
+    def on_transcribed(item: tuple, transcribed: dict) -> None:
+        manifest.mark(item[1], TRANSCRIBED)
+        if "metrics" in transcribed:
+            store.add_metrics(run_id, model_name, item[0], transcribed["metrics"])
     
-    # Process files in parallel
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_uuid = {
-            executor.submit(process_single_file, file_path, file_uuid, model_name): file_uuid
-            for file_path, file_uuid in audio_files
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_uuid):
-            file_uuid = future_to_uuid[future]
-            try:
-                result = future.result()
-                results.append(result)
-            except Exception as e:
-                print(f"❌ Task failed for {file_uuid}: {str(e)}")
-                results.append({
-                    "overview": {"ext_uuid": file_uuid},
-                    "ai_overview": {"error": str(e)}
-                })
+    # Transcripts flow into sentiment analysis as soon as they are ready
+    if execution_mode == "process":
+        executor = create_process_pool(model_name, num_workers=stt_workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=stt_workers)
+
+    results_writer = JsonlResultWriter(str(results_path), append=args.resume)
+    # Opened with the other resources so it is closed if any stage raises, and last,
+    # after the executor has finished the callbacks that write to it
+    with ResultsStore() as store, manifest, results_writer, executor:
+        pipeline = StagedPipeline(
+            transcribe_fn=transcribe_file,
+            analyze_fn=analyze_transcription,
+            error_fn=error_result,
+            stt_executor=executor,
+            stt_workers=stt_workers,
+            analysis_workers=analysis_workers,
+            queue_size=queue_size,
+            on_transcribed=on_transcribed,
+        )
+        for result in pipeline.run(
+            (file_path, file_uuid, model_name, force_transcription)
+            for file_path, file_uuid in pending_files
+        ):
+            file_uuid = result["overview"]["uuid"]
+            if "error" in result["ai_overview"]:
+                manifest.mark(file_uuid, FAILED, error=result["ai_overview"]["error"])
+            else:
+                results_writer.write(result)
+                manifest.mark(file_uuid, ANALYZED)
     
-    # Save all results to single JSON file
+    # Save all results to single JSON file, streamed from the results file
     saved_file = save_combined_results(
-        results=results,
+        results=combined_results(str(results_path), manifest.failed()),
         model_name=model_name,
         output_dir=output_dir
     )
+
+    # Index the run for cross-run queries; scripts/import_outputs.py skips files recorded here
+    with ResultsStore() as store:
+        store.add_run(run_id, run_started, source=str(saved_file.resolve()))
+        store.add_combined_results(
+            run_id,
+            model_name,
+            combined_results(str(results_path), manifest.failed()),
+            run_started,
+        )
      
     print(f"\n{'='*60}")
     print(f"✅ All processing complete!")
     print(f"📁 Results saved to: {saved_file}")
-    print(f"📊 Processed {len(results)} file(s)")
+    print(f"📄 Streamed results: {results_path}")
+    print(f"🗄️  Results store: {RESULTS_DB_PATH} (run {run_id})")
+    print(f"📊 Processed {len(pending_files)} file(s) in this run")
+    print(f"🗒️  Manifest: {manifest_path} {manifest.counts()}")
+    llm_cache_stats = get_llm_cache().stats()
+    print(f"💾 LLM cache: {llm_cache_stats['hits']} hit(s), {llm_cache_stats['misses']} miss(es)")
     print(f"{'='*60}")
     
 